@@ -1,5 +1,6 @@
-from sargeparse.sarge import Sarge, SubCommand  # NOQA
+from sargeparse.sarge import Sarge, SubCommand, CompiledSarge, ParseResult  # NOQA
 from sargeparse.consts import unset, stop, die, suppress, remainder  # NOQA
+from sargeparse.config import ConfigLoader, json_config, ini_config, toml_config  # NOQA
 
 __description__ = "A mildly opinionated argument parsing library based on argparse"
 __author__ = "Diego Pomares"
@@ -1,4 +1,7 @@
 from sargeparse._parser.argument import Argument  # NOQA
 from sargeparse._parser.group import ArgumentGroup, MutualExclussionGroup  # NOQA
-from sargeparse._parser.data import ArgumentData  # NOQA
+from sargeparse._parser.data import ArgumentData, FrozenArgumentData  # NOQA
 from sargeparse._parser.parser import Parser  # NOQA
+from sargeparse._parser.matcher import FastMatcher  # NOQA
+from sargeparse._parser.index import ArgumentIndex  # NOQA
+from sargeparse._parser.registry import SubcommandRegistry  # NOQA
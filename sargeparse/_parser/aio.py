@@ -0,0 +1,49 @@
+import sys
+import asyncio
+import inspect
+
+import sargeparse.consts
+
+
+class _Exit(Exception):
+    """Carries SystemExit out of the task created for the timeout, asyncio would re-raise it from the event loop"""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+async def dispatch_async(data, *, obj=None, timeout=None):
+    """See ArgumentData.dispatch_async()"""
+
+    try:
+        if timeout is None:
+            return await _dispatch(data, obj)
+
+        return await asyncio.wait_for(_dispatch(data, obj), timeout)
+
+    except _Exit as ex:
+        raise SystemExit(ex.code) from None
+
+
+async def _dispatch(data, obj):
+    return_value = None
+
+    try:
+        for i, fn in enumerate(data.callbacks):
+            return_value = fn(data._make_context(i, obj=obj, return_value=return_value))
+
+            if inspect.isawaitable(return_value):
+                return_value = await return_value
+
+            if return_value == sargeparse.die:
+                sys.exit(return_value.value)
+
+            elif return_value == sargeparse.stop:
+                return_value = return_value.value
+                break
+
+    except SystemExit as ex:
+        raise _Exit(ex.code) from None
+
+    return return_value
@@ -1,10 +1,13 @@
 import os
 import re
+import sys
 import logging
+import functools
 import collections
 
 import sargeparse.consts
 
+from sargeparse.argsfile import iter_delimited
 from sargeparse.context_manager import check_kwargs
 
 LOG = logging.getLogger(__name__)
@@ -27,6 +30,8 @@ class Argument:
             'default': definition.pop('default', sargeparse.unset),
             'envvar': definition.pop('envvar', sargeparse.unset),
             'config_path': definition.pop('config_path', sargeparse.unset),
+            'type_cache': definition.pop('type_cache', None),
+            'stream': definition.pop('stream', False),
         }
 
         self.names = None
@@ -35,20 +40,47 @@ class Argument:
         self.mutex_group = self.custom_parameters['mutex_group']
         self.add_argument_kwargs = definition
 
+        # Built on first use, see _get_type_function()
+        self._cached_type = None
+        self._converted_default = sargeparse.unset
+
         self._process_add_argument_kwargs(main_command=main_command)
         self._process_custom_parameters(main_command=main_command)
 
-    def get_value_from_envvar(self, *, default=None):
-        """Return value as read from the environment variable, and apply its type"""
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Conversion caches can't be pickled
+        state['_cached_type'] = None
+        state['_converted_default'] = sargeparse.unset
+
+        return state
+
+    def get_envvar_name(self, envvar_prefix=None):
+        """Return 'envvar', or <envvar_prefix><DEST> if it's not set and there is a prefix, or None"""
+
+        if self.custom_parameters['envvar'] != sargeparse.unset:
+            return self.custom_parameters['envvar']
 
-        if self.custom_parameters['envvar'] == sargeparse.unset:
+        if envvar_prefix:
+            return envvar_prefix + self.dest.upper()
+
+        return None
+
+    def get_value_from_envvar(self, *, default=None, envvar_prefix=None, environ=None):
+        """Return value as read from the environment variable (in os.environ, or environ), and apply its type"""
+
+        envvar = self.get_envvar_name(envvar_prefix)
+        if envvar is None:
             return default
 
-        envvar = self.custom_parameters['envvar']
-        if envvar not in os.environ:
+        if environ is None:
+            environ = os.environ
+
+        if envvar not in environ:
             return default
 
-        value = os.environ[envvar]
+        value = environ[envvar]
         return self._apply_type(value)
 
     def get_default_value(self, *, default=None, apply_type=False):
@@ -61,19 +93,37 @@ class Argument:
         if not apply_type:
             return value
 
-        return self._apply_type(value)
+        # With 'type_cache', the default is converted once
+        if not self.custom_parameters['type_cache']:
+            return self._apply_type(value)
 
-    def get_value_from_config(self, config, *, default=None):
-        """Return value from dict, and apply its type"""
+        if self._converted_default == sargeparse.unset:
+            self._converted_default = self._apply_type(value)
 
-        if self.custom_parameters['config_path'] == sargeparse.unset:
-            return default
+        return self._converted_default
 
-        config_path = self.custom_parameters['config_path']
-        try:
-            value = self._get_value_from_path(config, config_path)
-        except KeyError:
-            return default
+    def make_stream(self, values):
+        """Return a single-pass iterator over values, with the type applied as they're read
+
+        With a single '-', values are read from stdin (newline or NUL delimited). With 'stream' set to 'stdin',
+        they're also read from stdin when there are no values and stdin isn't a terminal. Return None if there
+        are no values to read and the argument has a 'default', so the default is used.
+        """
+
+        if values == ['-'] or (not values and self._reads_stdin_implicitly()):
+            values = iter_delimited(sys.stdin.buffer)
+
+        elif not values and self.custom_parameters['default'] != sargeparse.unset:
+            return None
+
+        fn = self._get_type_function()
+        return (fn(value) for value in values or ())
+
+    def _reads_stdin_implicitly(self):
+        return self.custom_parameters['stream'] == 'stdin' and sys.stdin is not None and not sys.stdin.isatty()
+
+    def convert_value(self, value):
+        """Return value with the argument's 'type' applied"""
 
         return self._apply_type(value)
 
@@ -85,8 +135,9 @@ class Argument:
     def validate_schema(self, schema):
         """Return True if the argument satisfies the schema"""
 
+        definition = collections.ChainMap(self.add_argument_kwargs, self.custom_parameters)
+
         for k, v in schema.items():
-            definition = collections.ChainMap(self.add_argument_kwargs, self.custom_parameters)
             if k in definition and definition[k] == v:
                 continue
             else:
@@ -95,13 +146,25 @@ class Argument:
         return True
 
     def _apply_type(self, value):
-        fn = self.add_argument_kwargs.get('type', self._same)
+        fn = self._get_type_function()
 
         if self._has_multiple_args():
             return [fn(v) for v in value]
 
         return fn(value)
 
+    def _get_type_function(self):
+        fn = self.add_argument_kwargs.get('type', self._same)
+
+        maxsize = self.custom_parameters['type_cache']
+        if not maxsize or fn is self._same:
+            return fn
+
+        if self._cached_type is None:
+            self._cached_type = _make_cached_type_function(fn, maxsize)
+
+        return self._cached_type
+
     def _process_add_argument_kwargs(self, main_command):
         self._process_common_add_argument_kwargs()
 
@@ -166,6 +229,22 @@ class Argument:
             self._process_custom_parameters_for_subcommand()
 
     def _process_common_custom_parameters(self):
+        # Validate 'stream'
+        if self.custom_parameters['stream'] not in (True, False, 'stdin'):
+            raise TypeError("'stream' must be a <bool> or 'stdin': '{}'".format(self.names[0]))
+
+        if self.custom_parameters['stream']:
+            if not self.is_positional() or self.add_argument_kwargs.get('nargs') not in ('*', '+'):
+                raise TypeError("Only positional arguments with nargs '*' or '+' can be 'stream': '{}'".format(
+                    self.names[0]
+                ))
+
+        # Validate 'type_cache'
+        type_cache = self.custom_parameters['type_cache']
+        if type_cache is not None:
+            if isinstance(type_cache, bool) or not isinstance(type_cache, int) or type_cache < 1:
+                raise TypeError("'type_cache' must be a positive <int> (the maximum number of cached values)")
+
         # Override default group names
         if not self.group:
             if self.custom_parameters.get('global'):
@@ -234,17 +313,23 @@ class Argument:
 
             self.add_argument_kwargs['help'] += "(default: {})".format(self.get_default_value())
 
-    def _get_value_from_path(self, dictionary, path):
-        """Return the value for path, where path represent a list of keys in nested dicts separated by '/'"""
-
-        key = path[0]
-
-        if len(path) == 1:
-            return dictionary[key]
-
-        return self._get_value_from_path(dictionary[key], path[1:])
-
     @staticmethod
     def _same(arg):
         """This is used as the default function for 'type' parameter"""
         return arg
+
+
+def _make_cached_type_function(fn, maxsize):
+    """Return fn with its results cached by value in an LRU cache, unhashable values are always converted"""
+
+    cached_fn = functools.lru_cache(maxsize=maxsize)(fn)
+
+    def type_function(value):
+        try:
+            hash(value)
+        except TypeError:
+            return fn(value)
+
+        return cached_fn(value)
+
+    return type_function
@@ -0,0 +1,75 @@
+import collections.abc
+
+
+class ConfigTrie:
+    """Trie of the 'config_path' of a parser's arguments, to read all of them with a single walk of the config"""
+
+    def __init__(self, arguments):
+        self._root = _ConfigTrieNode()
+
+        for position, argument in enumerate(arguments):
+            config_path = argument.custom_parameters['config_path']
+            if not isinstance(config_path, list):
+                continue
+
+            node = self._root
+            for key in config_path:
+                node = node.children.setdefault(key, _ConfigTrieNode())
+
+            node.arguments.append((position, argument))
+
+    def extract(self, config):
+        """Return a list of (argument, value) for the arguments with a value in config, in argument order"""
+
+        values = []
+        self._extract(config, self._root, values)
+        values.sort(key=lambda item: item[0])
+
+        return [(argument, value) for _, argument, value in values]
+
+    def _extract(self, value, node, values):
+        for position, argument in node.arguments:
+            values.append((position, argument, value))
+
+        for key, child in node.children.items():
+            try:
+                child_value = value[key]
+            except KeyError:
+                continue
+
+            self._extract(child_value, child, values)
+
+    @staticmethod
+    def find_unused_paths(config, tries):
+        """Return the paths ('/' separated) of the values in config that no argument in tries reads"""
+
+        unused = []
+        _find_unused_paths(config, [trie._root for trie in tries], [], unused)  # pylint: disable=protected-access
+        return unused
+
+
+class _ConfigTrieNode:
+    __slots__ = ('children', 'arguments')
+
+    def __init__(self):
+        self.children = {}
+        self.arguments = []
+
+
+def _find_unused_paths(value, nodes, path, unused):
+    # An argument reads the whole value, including anything nested in it
+    if any(node.arguments for node in nodes):
+        return
+
+    is_mapping = isinstance(value, collections.abc.Mapping)
+
+    if path and (not nodes or not is_mapping or not value):
+        unused.append('/'.join(str(key) for key in path))
+        return
+
+    if not is_mapping:
+        return
+
+    for key, child_value in value.items():
+        children = [node.children[key] for node in nodes if key in node.children]
+        _find_unused_paths(child_value, children, path + [key], unused)
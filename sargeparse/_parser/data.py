@@ -1,19 +1,56 @@
+import os
 import sys
+import threading
 from collections import ChainMap
+from collections.abc import Mapping
 
 import sargeparse.consts
 
+from sargeparse._parser.config import ConfigTrie
 from sargeparse._parser.parser import Parser
 
 
+class _SourceState:
+    """What ArgumentData needs to read its sources again: the commands that ran, their arguments, how the
+    configuration was read, and who is notified of changes"""
+
+    def __init__(self, read_config):
+        self.active_parsers = []
+
+        # (argument, environment variable name, envvar prefix) of the commands that ran
+        self.arguments = []
+
+        self.read_config = read_config
+        self.config_data = {}
+        self.config_tries = []
+
+        self.subscribers = []
+        self.lock = threading.Lock()
+
+
 class ArgumentData(ChainMap):
+    """Parsed values, in one dict per data source, looked up following the precedence of the sources
+
+    With skip_shadowed=True, values from the environment, configuration and defaults are not read (nor is their
+    type applied) for arguments that already have a value in a source with higher precedence. The resolved values
+    are the same, but those sources only contain the values that are used, so changing the precedence after
+    parsing doesn't bring the skipped values back. If the configuration has higher precedence than the defaults,
+    the defaults of arguments with a 'config_path' are set after the configuration is read.
+
+    refresh() reads the environment and/or the configuration again, without parsing the command line.
+    """
+
+    _refreshable_sources = ('environment', 'configuration', 'defaults')
+
     _default_precedence = ['cli', 'environment', 'configuration', 'defaults']
 
-    def __init__(self, parser: Parser, precedence=None):
+    def __init__(self, parser: Parser, precedence=None, *, skip_shadowed=False, read_config=None):
         super().__init__()
 
         self._parser = parser
-        self._config_data = {}
+        self._skip_shadowed = skip_shadowed
+        self._deferred_defaults = []
+        self._state = _SourceState(read_config)
         self._data_sources = {}
         self.callbacks = []
 
@@ -32,36 +69,109 @@ class ArgumentData(ChainMap):
         self.set_precedence(precedence)
 
     def set_precedence(self, precedence):
-        precedence = precedence or self._default_precedence
+        precedence = self.validate_precedence(precedence)
 
-        difference = set(self._default_precedence).symmetric_difference(set(precedence))
+        precedence = self._format_precedence_list(precedence)
+        self.maps = [self._data_sources[k] for k in precedence]
+        self._precedence = precedence
+
+    def freeze(self):
+        """Return a read-only FrozenArgumentData with the values resolved according to the current precedence"""
+
+        values = {}
+        sources = {}
+
+        # Lowest precedence first, so values from sources with higher precedence replace them
+        for source in reversed(self._precedence):
+            data_source = self._data_sources[source]
+            values.update(data_source)
+            sources.update(dict.fromkeys(data_source, source))
+
+        return FrozenArgumentData(values, sources)
+
+    @classmethod
+    def validate_precedence(cls, precedence):
+        """Return precedence, or the default one if empty, raise TypeError if it's not valid"""
+
+        precedence = precedence or cls._default_precedence
+
+        difference = set(cls._default_precedence).symmetric_difference(set(precedence))
         if difference:
             msg = "Precedence must contain all and only these elements: {}"
-            raise TypeError(msg.format(self._default_precedence))
+            raise TypeError(msg.format(cls._default_precedence))
 
-        precedence = self._format_precedence_list(precedence)
-        self.maps = [self._data_sources[k] for k in precedence]
+        return list(precedence)
 
     def clear_all(self):
         for d in self._data_sources.values():
             d.clear()
 
+    def refresh(self, sources=('configuration', 'environment')):
+        """Read the sources again for the commands that ran, and return the keys whose value changed
+
+        Each source is replaced at once, readers see either the old or the new values. The configuration is read
+        by calling read_config again. Subscribers are called with the set of changed keys, if there are any.
+        """
+
+        sources = set(sources)
+        unknown = sources.difference(self._refreshable_sources)
+        if unknown:
+            raise ValueError("Only these sources can be refreshed: {}".format(list(self._refreshable_sources)))
+
+        with self._state.lock:
+            before = dict(self)
+
+            # Skipped values of sources with lower precedence may be needed now
+            if self._skip_shadowed:
+                highest = min(self._precedence.index(source) for source in sources)
+                sources.update(s for s in self._precedence[highest:] if s in self._refreshable_sources)
+
+            for source in self._precedence:
+                if source not in sources:
+                    continue
+
+                if source == 'environment':
+                    data_source = self._parse_envvars(self._state.arguments, {})
+                elif source == 'configuration':
+                    data_source = self._parse_config(self._call_read_config(), {})
+                else:
+                    data_source = self._parse_defaults(self._state.arguments, self._get_set_defaults(), defer=False)
+
+                self._replace_data_source(source, data_source)
+
+            after = dict(self)
+
+        changed = {
+            k for k in set(before).union(after)
+            if before.get(k, sargeparse.unset) != after.get(k, sargeparse.unset)
+        }
+
+        if changed:
+            for fn in list(self._state.subscribers):
+                fn(changed)
+
+        return changed
+
+    def subscribe(self, fn):
+        """Call fn with the set of changed keys every time refresh() changes some value"""
+
+        self._state.subscribers.append(fn)
+
+    def unsubscribe(self, fn):
+        self._state.subscribers.remove(fn)
+
+    def _replace_data_source(self, source, data_source):
+        self._data_sources[source] = data_source
+        setattr(self, source, data_source)
+
+        # Replace the whole list, so lookups never see a mix of old and new sources
+        self.maps = [self._data_sources[k] for k in self._precedence]
+
     def dispatch(self, *, obj=None):
-        last_callback = len(self.callbacks) - 1
         return_value = None
 
         for i, fn in enumerate(self.callbacks):
-            parser_data = self.parser_data[fn.parser.parser_key()]
-            last = (i == last_callback)
-            ctx = Context(
-                data=self,
-                obj=obj,
-                parser_data=parser_data,
-                last=last,
-                return_value=return_value,
-
-            )
-            return_value = fn(ctx)
+            return_value = fn(self._make_context(i, obj=obj, return_value=return_value))
 
             if return_value == sargeparse.die:
                 sys.exit(return_value.value)
@@ -72,6 +182,29 @@ class ArgumentData(ChainMap):
 
         return return_value
 
+    def dispatch_async(self, *, obj=None, timeout=None):
+        """Return a coroutine that calls the callbacks like dispatch(), awaiting the ones that return awaitables
+
+        Callbacks run in the event loop that awaits the coroutine, so sync callbacks shouldn't block. If 'timeout'
+        (in seconds, for all the callbacks) expires, the running callback is cancelled and asyncio.TimeoutError is
+        raised. Cancelling the coroutine cancels the running callback, the remaining ones aren't called.
+        """
+
+        # Coroutine syntax needs Python >= 3.5, it's only imported when used
+        from sargeparse._parser.aio import dispatch_async
+        return dispatch_async(self, obj=obj, timeout=timeout)
+
+    def _make_context(self, i, *, obj, return_value):
+        fn = self.callbacks[i]
+
+        return Context(
+            data=self,
+            obj=obj,
+            parser_data=self.parser_data[fn.parser.parser_key()],
+            last=(i == len(self.callbacks) - 1),
+            return_value=return_value,
+        )
+
     @staticmethod
     def _format_precedence_list(precedence):
         return ['override'] + precedence + ['arg_default']
@@ -81,112 +214,249 @@ class ArgumentData(ChainMap):
             if v == sargeparse.unset:
                 self.cli.pop(k)
 
-    def _move_defaults_from_data_sources_cli(self, parser=None):
-        parser = parser or self._parser
+    def _set_active_path(self, subcommands):
+        """Record the main command and the subcommands selected in the command line, by their names"""
 
-        key = parser.parser_key()
-        if key not in self.cli:
-            return
+        parser = self._parser
+        self._state.active_parsers = [parser]
 
-        defaults = self.cli[key].get('defaults', {})
+        for name in subcommands:
+            parser = parser.subparsers.get(name)
 
-        self.defaults.update(defaults)
+            # Subcommands that aren't part of the definition (like 'help') don't add any data
+            if parser is None:
+                break
+
+            self._state.active_parsers.append(parser)
+
+    def _move_defaults_from_data_sources_cli(self):
+        for parser in self._state.active_parsers:
+            defaults = self.cli.get(parser.parser_key(), {}).get('defaults', {})
+            self.defaults.update(defaults)
 
-        for subparser in parser.subparsers:
-            self._move_defaults_from_data_sources_cli(subparser)
+    def _get_set_defaults(self):
+        """Return the 'defaults' of the commands that ran, the ones moved from the cli source when parsing"""
+
+        defaults = {}
+        for parser in self._state.active_parsers:
+            defaults.update(parser.set_defaults_kwargs)
+
+        return defaults
 
     def _parse_callbacks(self):
         self.callbacks = self._get_callbacks()
 
-    def _get_callbacks(self, parser=None):
-        parser = parser or self._parser
+    def _get_callbacks(self):
         callback_list = []
 
-        key = parser.parser_key()
-        if key not in self.cli:
-            return []
+        for parser in self._state.active_parsers:
+            callback = self.cli.get(parser.parser_key(), {}).get('callback')
 
-        callback = self.cli[key].get('callback')
+            if callback:
+                callback_list.append(callback)
 
-        if callback:
-            callback_list.append(callback)
+        return callback_list
 
-        for subparser in parser.subparsers:
-            callback_list.extend(
-                self._get_callbacks(subparser)
-            )
+    def _is_shadowed(self, dest, source):
+        """Return True if dest has a value in a source with higher precedence than source"""
 
-        return callback_list
+        if not self._skip_shadowed:
+            return False
+
+        for higher_source in self._precedence:
+            if higher_source == source:
+                return False
+
+            if dest in self._data_sources[higher_source]:
+                return True
+
+        return False
 
-    def _parse_envvars_and_defaults(self, parser=None):
-        parser = parser or self._parser
+    def _parse_envvars_and_defaults(self):
+        self._collect_arguments()
 
-        # No point in adding data from subcommands that did not run
-        key = parser.parser_key()
-        if key not in self.cli:
-            return
+        # Fill sources with higher precedence first, so shadowed values can be skipped
+        phases = {
+            'environment': lambda: self._parse_envvars(self._state.arguments, self.environment),
+            'defaults': lambda: self._parse_defaults(self._state.arguments, self.defaults),
+        }
+        for source in self._precedence:
+            if source in phases:
+                phases[source]()
 
-        for argument in parser.arguments:
-            dest = argument.dest
+    def _collect_arguments(self):
+        """Record (argument, environment variable name, envvar prefix) of the commands that ran"""
 
-            envvar = argument.get_value_from_envvar(default=sargeparse.unset)
-            if envvar != sargeparse.unset:
-                self.environment[dest] = envvar
+        self._state.arguments = []
+        envvar_prefix = None
+
+        for parser in self._state.active_parsers:
+            envvar_prefix = parser.envvar_prefix or envvar_prefix
+            envvar_names = parser.get_envvar_names(envvar_prefix)
+
+            for argument, envvar in zip(parser.arguments, envvar_names):
+                self._state.arguments.append((argument, envvar, envvar_prefix))
+                self._arg_default[argument.dest] = parser.argument_parser_kwargs['argument_default']
+
+    def _parse_defaults(self, arguments, defaults, defer=True):
+        defer = defer and self._skip_shadowed and \
+            self._precedence.index('configuration') < self._precedence.index('defaults')
+
+        for argument, _, _ in arguments:
+            if self._is_shadowed(argument.dest, 'defaults'):
+                continue
+
+            # The configuration is read later, and may shadow the default
+            if defer and argument.custom_parameters['config_path'] != sargeparse.unset:
+                self._deferred_defaults.append((argument, None, None))
+                continue
 
             default = argument.get_default_value(default=sargeparse.unset, apply_type=True)
             if default != sargeparse.unset:
-                self.defaults[dest] = default
+                defaults[argument.dest] = default
+
+        return defaults
+
+    def _parse_streams(self):
+        for argument, _, _ in self._state.arguments:
+            if not argument.custom_parameters['stream']:
+                continue
+
+            stream = argument.make_stream(self.cli.get(argument.dest))
+            if stream is not None:
+                self.cli[argument.dest] = stream
+
+    def _parse_deferred_defaults(self):
+        deferred_defaults, self._deferred_defaults = self._deferred_defaults, []
+        self._parse_defaults(deferred_defaults, self.defaults, defer=False)
+
+    def _parse_envvars(self, arguments, environment):
+        # Scan the environment once, only the values of variables used by some argument are converted
+        wanted = {envvar for _, envvar, _ in arguments if envvar is not None}
+        environ = {envvar: value for envvar, value in os.environ.items() if envvar in wanted}
+
+        for argument, envvar, envvar_prefix in arguments:
+            if envvar not in environ or self._is_shadowed(argument.dest, 'environment'):
+                continue
 
-            self._arg_default[dest] = parser.argument_parser_kwargs['argument_default']
+            environment[argument.dest] = argument.get_value_from_envvar(
+                envvar_prefix=envvar_prefix,
+                environ=environ,
+            )
+
+        return environment
+
+    def unused_config_keys(self):
+        """Return the paths ('/' separated) of the values in the configuration that no argument reads"""
+
+        return ConfigTrie.find_unused_paths(self._state.config_data, self._state.config_tries)
+
+    def _call_read_config(self):
+        if self._state.read_config is None:
+            return {}
+
+        if not callable(self._state.read_config):
+            raise TypeError("'read_config' is not callable")
+
+        config = self._state.read_config(self)
+        if config is None:
+            config = {}
+
+        if not isinstance(config, dict):
+            msg = "read_config returned a {} when a dict (or None) was expected"
+            raise TypeError(msg.format(type(config)))
+
+        return config
+
+    def _parse_config(self, config, configuration):
+        self._state.config_data = config
+        self._state.config_tries = []
+
+        for parser in self._state.active_parsers:
+            config_trie = parser.get_config_trie()
+            self._state.config_tries.append(config_trie)
 
-        for subparser in parser.subparsers:
-            self._parse_envvars_and_defaults(subparser)
+            for argument, value in config_trie.extract(config):
+                if not self._is_shadowed(argument.dest, 'configuration'):
+                    configuration[argument.dest] = argument.convert_value(value)
 
-    def _parse_config(self, config, parser=None):
-        parser = parser or self._parser
-        self._config_data = config
+        return configuration
 
-        # No point in adding data from subcommands that did not run
-        key = parser.parser_key()
-        if key not in self.cli:
-            return
+    def _remove_parser_key_from_data_sources_cli(self):
+        for parser in self._state.active_parsers:
+            self.cli.pop(parser.parser_key(), None)
 
-        for argument in parser.arguments:
-            dest = argument.dest
 
-            config_value = argument.get_value_from_config(config, default=sargeparse.unset)
-            if config_value != sargeparse.unset:
-                self.configuration[dest] = config_value
+class FrozenArgumentData(Mapping):
+    """Read-only snapshot of ArgumentData, values can also be read as attributes
 
-            self._arg_default[dest] = parser.argument_parser_kwargs['argument_default']
+    source(key) returns the data source the value was taken from: 'override', 'cli', 'environment',
+    'configuration', 'defaults' or 'arg_default'.
+    """
 
-        for subparser in parser.subparsers:
-            self._parse_config(config, subparser)
+    __slots__ = ('_values', '_sources')
 
-    def _remove_parser_key_from_data_sources_cli(self, parser=None):
-        parser = parser or self._parser
+    def __init__(self, values, sources):
+        self._values = values
+        self._sources = sources
 
-        key = parser.parser_key()
-        if key not in self.cli:
-            return
+    def __getitem__(self, key):
+        return self._values[key]
 
-        self.cli.pop(key)
+    def __iter__(self):
+        return iter(self._values)
 
-        for subparser in parser.subparsers:
-            self._remove_parser_key_from_data_sources_cli(subparser)
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getattr__(self, name):
+        if name in FrozenArgumentData.__slots__:
+            raise AttributeError(name)
+
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self._values)
+
+    def __getstate__(self):
+        return self._values, self._sources
+
+    def __setstate__(self, state):
+        self._values, self._sources = state
+
+    def source(self, key):
+        return self._sources[key]
 
 
 class Context:
     def __init__(self, **kwargs):
         self.data = kwargs.get('data')
         self.obj = kwargs.get('obj')
-        self.parser = ParserData(**kwargs.get('parser_data'))
+        self.parser = ParserData(kwargs.get('parser_data'))
         self.last = kwargs.get('last')
         self.return_value = kwargs.get('return_value')
 
 
 class ParserData:
-    def __init__(self, **parser_data):
-        self.prog = parser_data['prog']
-        self.help = parser_data['help']
-        self.usage = parser_data['usage']
+    """Read parser data on access, so help and usage are only rendered when a callback uses them"""
+
+    def __init__(self, parser_data):
+        self._parser_data = parser_data
+
+    @property
+    def prog(self):
+        return self._parser_data['prog']
+
+    @property
+    def help(self):
+        return self._parser_data['help']
+
+    @property
+    def usage(self):
+        return self._parser_data['usage']
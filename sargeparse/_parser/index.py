@@ -0,0 +1,78 @@
+from sargeparse._parser.group import MutualExclussionGroup
+
+
+class ArgumentIndex:
+    """Partitions of a parser's arguments, kept up to date as arguments are added
+
+    All lists keep the order in which arguments were added. They must not be modified from outside.
+    """
+
+    def __init__(self):
+        self.arguments = []
+        self.global_arguments = []
+        self.local_arguments = []
+        self.positional_arguments = []
+        self.optional_arguments = []
+        self.groups = {}
+        self.mutex_groups = {}
+
+    def add(self, argument):
+        """Add argument to the index, raise ValueError if it doesn't fit in its mutex group"""
+
+        if argument.mutex_group:
+            self._validate_mutex_group(argument)
+
+        self.arguments.append(argument)
+
+        if argument.validate_schema({'global': True}):
+            self.global_arguments.append(argument)
+        elif argument.validate_schema({'global': False}):
+            self.local_arguments.append(argument)
+
+        if argument.is_positional():
+            self.positional_arguments.append(argument)
+        else:
+            self.optional_arguments.append(argument)
+
+        self.groups.setdefault(argument.group, []).append(argument)
+
+        if argument.mutex_group:
+            if argument.mutex_group not in self.mutex_groups:
+                self.mutex_groups[argument.mutex_group] = MutualExclussionGroup(
+                    required=argument.add_argument_kwargs.get('required', False)
+                )
+
+            self.mutex_groups[argument.mutex_group].arguments.append(argument)
+
+    def select(self, schema=None):
+        """Return the arguments that satisfy the schema, see Argument.validate_schema()"""
+
+        if not schema:
+            return self.arguments
+
+        if list(schema) == ['global']:
+            if schema['global'] is True:
+                return self.global_arguments
+
+            if schema['global'] is False:
+                return self.local_arguments
+
+        return [a for a in self.arguments if a.validate_schema(schema)]
+
+    def _validate_mutex_group(self, argument):
+        mutex_group = self.mutex_groups.get(argument.mutex_group)
+        if not mutex_group:
+            return
+
+        # All arguments in the group share these properties, comparing with any of them is enough
+        other = mutex_group.arguments[0]
+        properties = {
+            'required': lambda a: a.validate_schema({'required': True}),
+            'global': lambda a: a.validate_schema({'global': True}),
+            'group': lambda a: a.group,
+        }
+
+        for k, fn in properties.items():
+            if fn(argument) != fn(other):
+                msg = "'{}' property must have the same value in all mutex group arguments".format(k)
+                raise ValueError(msg)
@@ -0,0 +1,184 @@
+import argparse
+
+import sargeparse.consts
+
+
+class FastMatcher:
+    """Match command lines without argparse when the definition only uses a simple subset of its features
+
+    Supported definitions only have optional arguments with 'store', 'store_true' or 'count' actions, and
+    subcommands. Every parser is checked (once) the first time it's used. match() returns None whenever the
+    definition or the command line are outside of that subset, argparse must be used in that case.
+    """
+
+    _supported_actions = (None, 'store', 'store_true', 'count')
+    _supported_kwargs = {'action', 'dest', 'help', 'metavar', 'type'}
+
+    def __init__(self, parser):
+        self._parser = parser
+        self._levels = {}
+        self._global_options = {}
+        self._global_prefixes = set()
+
+        root = self._get_level(parser)
+        self.supported = root is not None
+
+    def match(self, argv):
+        """Return (values, subcommand names) as they'd result from parsing argv with argparse, or None"""
+
+        level = self._get_level(self._parser)
+        if level is None:
+            return None
+
+        global_namespace = dict(level.namespace)
+        namespace = global_namespace
+        path = []
+
+        i = 0
+        while i < len(argv):
+            token = argv[i]
+            i += 1
+
+            if not token.startswith('-'):
+                subparser = level.subparsers.get(token)
+                if subparser is None:
+                    return None
+
+                level = self._get_level(subparser)
+                if level is None:
+                    return None
+
+                # argparse parses subcommands in their own namespace, and then copies it to the parent one
+                namespace = dict(level.namespace)
+                path.append((token, namespace))
+                continue
+
+            option_string, explicit_value = token, None
+            argument, target = self._get_option(option_string, level, global_namespace, namespace)
+
+            if argument is None and token.startswith('--') and '=' in token:
+                option_string, explicit_value = token.split('=', 1)
+                argument, target = self._get_option(option_string, level, global_namespace, namespace)
+
+            if argument is None:
+                return None
+
+            action = argument.add_argument_kwargs.get('action')
+
+            if action == 'store_true':
+                if explicit_value is not None:
+                    return None
+
+                target[argument.dest] = True
+
+            elif action == 'count':
+                if explicit_value is not None:
+                    return None
+
+                count = target.get(argument.dest)
+                target[argument.dest] = 1 if count in (None, sargeparse.unset) else count + 1
+
+            else:
+                value = explicit_value
+                if value is None:
+                    if i >= len(argv) or argv[i].startswith('-'):
+                        return None
+
+                    value = argv[i]
+                    i += 1
+
+                type_fn = argument.add_argument_kwargs.get('type') or (lambda v: v)
+                try:
+                    target[argument.dest] = type_fn(value)
+                except (TypeError, ValueError, argparse.ArgumentTypeError):
+                    return None
+
+        values = global_namespace
+        for _, namespace in path:
+            values.update(namespace)
+
+        return values, [name for name, _ in path]
+
+    def _get_option(self, option_string, level, global_namespace, namespace):
+        # Global arguments are parsed first, from anywhere in the command line
+        argument = self._global_options.get(option_string)
+        if argument is not None:
+            return argument, global_namespace
+
+        if option_string in self._global_prefixes or option_string[:2] in self._global_options:
+            return None, None
+
+        argument = level.options.get(option_string)
+        if argument is not None:
+            return argument, namespace
+
+        return None, None
+
+    def _get_level(self, parser):
+        key = parser.parser_key()
+
+        try:
+            return self._levels[key]
+        except KeyError:
+            pass
+
+        level = None
+        if self._is_parser_supported(parser):
+            level = _Level(parser)
+
+            if parser is self._parser:
+                self._global_options = level.global_options
+
+                # argparse would take these as abbreviations (or short options with a value) of global options
+                self._global_prefixes = {
+                    option_string[:i]
+                    for option_string in level.global_options
+                    for i in range(2, len(option_string))
+                }
+
+        self._levels[key] = level
+        return level
+
+    def _is_parser_supported(self, parser):
+        kwargs = parser.argument_parser_kwargs
+
+        if kwargs.get('prefix_chars', '-') != '-' or kwargs.get('fromfile_prefix_chars'):
+            return False
+
+        if not parser.main_command and kwargs.get('argument_default') != sargeparse.unset:
+            return False
+
+        if parser.add_subparsers_kwargs.get('required') or 'dest' in parser.add_subparsers_kwargs:
+            return False
+
+        return all(self._is_argument_supported(argument) for argument in parser.arguments)
+
+    def _is_argument_supported(self, argument):
+        kwargs = argument.add_argument_kwargs
+
+        return all((
+            not argument.is_positional(),
+            not argument.mutex_group,
+            kwargs.get('action') in self._supported_actions,
+            set(kwargs).issubset(self._supported_kwargs),
+        ))
+
+
+class _Level:
+    """Lookup tables for one parser"""
+
+    def __init__(self, parser):
+        self.options = {}
+        self.global_options = {}
+        self.subparsers = parser.subparsers
+
+        # Initial namespace: argument defaults and set_defaults() values
+        self.namespace = {}
+        self.namespace.update(parser.get_set_default_kwargs())
+
+        for argument in parser.arguments:
+            self.namespace[argument.dest] = sargeparse.unset
+
+            options = self.global_options if argument.custom_parameters['global'] else self.options
+            for name in argument.names:
+                options[name] = argument
@@ -10,10 +10,31 @@ from sargeparse.version import python_version
 
 from sargeparse._parser.argument import Argument
 from sargeparse._parser.group import ArgumentGroup, MutualExclussionGroup
+from sargeparse._parser.config import ConfigTrie
+from sargeparse._parser.index import ArgumentIndex
+from sargeparse._parser.registry import SubcommandRegistry
 
 LOG = logging.getLogger(__name__)
 
 
+class _CompileState:
+    """Revision and position of a Parser in the command tree, and the values built from its definition when they
+    are first needed"""
+
+    def __init__(self):
+        # Incremented every time the definition changes, propagated to parent parsers
+        self.revision = 0
+        self.parents = []
+
+        # Subcommand names from the main command, used to make parser keys that are stable across processes
+        self.path = ()
+        self.parser_key = None
+
+        self.help_argument = None
+        self.envvar_names = None
+        self.config_trie = None
+
+
 class Parser:
     def __init__(self, definition, **kwargs):
         definition = definition.copy()
@@ -23,7 +44,9 @@ class Parser:
             self._show_warnings = kwargs.pop('show_warnings')
 
         self.arguments = []
-        self.subparsers = []
+        self.subparsers = SubcommandRegistry()
+        self.argument_index = ArgumentIndex()
+        self._state = _CompileState()
 
         self.custom_parameters = {
             'callback': definition.pop('callback', None),
@@ -33,6 +56,7 @@ class Parser:
             'add_help': definition.pop('add_help', True),
             'defaults': definition.pop('defaults', {}),
             'subparser': definition.pop('subparser', {}),
+            'envvar_prefix': definition.pop('envvar_prefix', None),
         }
 
         self._prefix_chars = definition.get('prefix_chars', '-')
@@ -43,12 +67,33 @@ class Parser:
         self.add_usage_to_parent_command_desc = self.custom_parameters['add_usage_to_parent_command_desc']
         self.set_defaults_kwargs = self.custom_parameters['defaults']
         self.add_subparsers_kwargs = self.custom_parameters['subparser']
+        self.envvar_prefix = self.custom_parameters['envvar_prefix']
         self.argument_parser_kwargs = definition
 
         self._process_argument_parser_kwargs()
         self._process_add_subparsers_kwargs()
         self._process_custom_parameters()
 
+        self._set_path(() if self.main_command else (self.name,))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # Callbacks may be wrapped in closures, they are rebuilt from the definition when unpickling
+        del state['callback']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        self.callback = self.custom_parameters['callback']
+        self._process_common_custom_parameters()
+
+    @property
+    def revision(self):
+        return self._state.revision
+
     def add_arguments(self, *definitions):
         for definition in definitions:
             argument = Argument(
@@ -57,24 +102,30 @@ class Parser:
                 prefix_chars=self._prefix_chars,
                 main_command=self.main_command,
             )
+            self.argument_index.add(argument)
             self.arguments.append(argument)
 
             if argument.is_positional():
                 self._has_positional_arguments = True
 
         self._log_warning_if_command_has_positional_arguments_and_subparsers()
+        self._touch()
 
     def add_subparsers(self, *subparsers):
         for subparser in subparsers:
-            self.subparsers.append(subparser)
+            self.subparsers.add(subparser)
+            subparser._state.parents.append(self)
+            subparser._set_path(self._state.path + (subparser.name,))
 
         self._log_warning_if_command_has_positional_arguments_and_subparsers()
+        self._touch()
 
     def add_set_defaults_kwargs(self, defaults):
         self.custom_parameters['defaults'].update(defaults)
+        self._touch()
 
     def parser_key(self):
-        return '_parser_{}'.format(id(self))
+        return self._state.parser_key
 
     def get_set_default_kwargs(self):
         kwargs = {}
@@ -86,8 +137,52 @@ class Parser:
 
         return {self.parser_key(): kwargs}
 
+    def get_envvar_names(self, envvar_prefix=None):
+        """Return the environment variable name of every argument (None if it isn't read from the environment)
+
+        envvar_prefix is inherited from the parent commands, the parser's own 'envvar_prefix' takes precedence
+        """
+
+        envvar_prefix = self.envvar_prefix or envvar_prefix
+
+        cached = self._state.envvar_names
+        if cached is not None and cached[:2] == (self.revision, envvar_prefix):
+            return cached[2]
+
+        envvar_names = [argument.get_envvar_name(envvar_prefix) for argument in self.arguments]
+
+        self._state.envvar_names = (self.revision, envvar_prefix, envvar_names)
+        return envvar_names
+
+    def get_config_trie(self):
+        """Return a ConfigTrie with the 'config_path' of the parser's arguments"""
+
+        cached = self._state.config_trie
+        if cached is not None and cached[0] == self.revision:
+            return cached[1]
+
+        config_trie = ConfigTrie(self.arguments)
+        self._state.config_trie = (self.revision, config_trie)
+        return config_trie
+
     def add_group_descriptions(self, descriptions):
         self.custom_parameters['group_descriptions'].update(descriptions)
+        self._touch()
+
+    def _set_path(self, path):
+        self._state.path = path
+        self._state.parser_key = '_parser_{}'.format(' '.join(path))
+
+        for subparser in self.subparsers:
+            subparser._set_path(path + (subparser.name,))  # pylint: disable=protected-access
+
+    def _touch(self):
+        """Mark the definition as changed, so compiled argparse parsers are rebuilt"""
+
+        self._state.revision += 1
+
+        for parent in self._state.parents:
+            parent._touch()  # pylint: disable=protected-access
 
     def _process_argument_parser_kwargs(self):
         self._process_common_argument_parser_kwargs()
@@ -152,6 +247,9 @@ class Parser:
             self._process_custom_parameters_for_subcommand()
 
     def _process_common_custom_parameters(self):
+        if self.envvar_prefix is not None and not isinstance(self.envvar_prefix, str):
+            raise TypeError("'envvar_prefix' must be a <str>")
+
         if not self.callback:
             self.callback = (lambda ctx: ctx.return_value)
 
@@ -217,37 +315,22 @@ class Parser:
             main_command=self.main_command,
         )
 
-    def _validate_mutex_groups(self):
-        mutex_groups = {a.mutex_group for a in self.arguments if a.mutex_group}
-
-        for mutex in mutex_groups:
-            properties = {
-                'required': {a.validate_schema({'required': True}) for a in self.arguments if a.mutex_group == mutex},
-                'global': {a.validate_schema({'global': True}) for a in self.arguments if a.mutex_group == mutex},
-                'group': {a.group for a in self.arguments if a.mutex_group == mutex},
-            }
-
-            for k, v in properties.items():
-                if len(v) > 1:
-                    msg = "'{}' property must have the same value in all mutex group arguments".format(k)
-                    raise ValueError(msg)
-
     def compile_argument_list(self, schema=None):
         schema = schema or {}
-        all_arguments = self.arguments.copy()
         argument_list = []
         mutexes = {}
         groups = {}
 
-        # Verify mutex_group conditions are right
-        self._validate_mutex_groups()
+        # Filter according to schema
+        arguments = self.argument_index.select(schema)
 
         # Add help
         if self.custom_parameters['add_help']:
-            all_arguments.append(self._make_help_argument())
+            if self._state.help_argument is None:
+                self._state.help_argument = self._make_help_argument()
 
-        # Filter according to schema
-        arguments = [a for a in all_arguments if a.validate_schema(schema)]
+            if self._state.help_argument.validate_schema(schema):
+                arguments = arguments + [self._state.help_argument]
 
         # Make groups / mutex_groups argument list
         for argument in arguments:
@@ -0,0 +1,81 @@
+class SubcommandRegistry:
+    """Subcommands of a parser, looked up by name or alias, or by unique prefix in O(length of the prefix)
+
+    Iterating over the registry yields the subcommand parsers in the order they were added.
+    """
+
+    def __init__(self):
+        self._parsers = []
+        self._names = {}
+        self._trie = _TrieNode()
+
+    def __iter__(self):
+        return iter(self._parsers)
+
+    def __len__(self):
+        return len(self._parsers)
+
+    def add(self, parser):
+        names = self.get_parser_names(parser)
+
+        for name in names:
+            if name in self._names:
+                raise ValueError("Subcommand name or alias '{}' is already in use".format(name))
+
+        self._parsers.append(parser)
+
+        for name in names:
+            self._names[name] = parser
+            self._trie.insert(name, parser)
+
+    def get(self, name, default=None):
+        """Return the subcommand parser for a name or alias"""
+
+        return self._names.get(name, default)
+
+    def get_by_prefix(self, prefix, default=None):
+        """Return the subcommand parser for a name or alias, or for the only one starting with prefix"""
+
+        parser = self._names.get(prefix)
+        if parser is not None:
+            return parser
+
+        node = self._trie.find(prefix)
+        if node is None or len(node.parsers) != 1:
+            return default
+
+        return next(iter(node.parsers.values()))
+
+    def names(self):
+        """Return all names and aliases, in the order they were added"""
+
+        return self._names.keys()
+
+    @staticmethod
+    def get_parser_names(parser):
+        return [parser.name] + list(parser.argument_parser_kwargs.get('aliases', []))
+
+
+class _TrieNode:
+    __slots__ = ('children', 'parsers')
+
+    def __init__(self):
+        self.children = {}
+
+        # Parsers with a name or alias going through this node, keyed by their name to count aliases only once
+        self.parsers = {}
+
+    def insert(self, name, parser):
+        node = self
+        for char in name:
+            node = node.children.setdefault(char, _TrieNode())
+            node.parsers[parser.name] = parser
+
+    def find(self, prefix):
+        node = self
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+
+        return node
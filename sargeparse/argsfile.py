@@ -0,0 +1,112 @@
+import os
+import sys
+import mmap
+import stat
+
+_chunk_size = 1024 * 1024
+
+
+def expand_argsfiles(argv, prefix='@', *, encoding=None):
+    """Yield the arguments in argv, replacing '<prefix><path>' by the arguments in that file
+
+    Files have one argument per line, or are NUL-delimited if they contain any NUL character. Arguments are
+    read from the file as they're consumed. Arguments inside files, and arguments after '--', aren't expanded.
+    """
+
+    expand = True
+
+    for arg in argv:
+        if expand and arg == '--':
+            expand = False
+
+        if expand and len(arg) > len(prefix) and arg.startswith(prefix):
+            yield from iter_argsfile(arg[len(prefix):], encoding=encoding)
+        else:
+            yield arg
+
+
+def iter_argsfile(path, *, encoding=None):
+    """Yield the arguments in a newline or NUL delimited file, memory-mapped if possible"""
+
+    if encoding is None:
+        encoding = sys.getfilesystemencoding()
+
+    with open(path, 'rb') as f:
+        buffer = None
+
+        # Pipes and files that report no size (like the ones in /proc) can't be mapped, they're read in chunks
+        file_stat = os.fstat(f.fileno())
+        if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+
+        if buffer is None:
+            yield from _iter_stream(f, encoding)
+            return
+
+        with buffer:
+            yield from _iter_mapped(buffer, file_stat.st_size, encoding)
+
+
+def iter_delimited(f, *, encoding=None):
+    """Yield the arguments in a newline or NUL delimited binary stream, as they're read"""
+
+    if encoding is None:
+        encoding = sys.getfilesystemencoding()
+
+    return _iter_stream(f, encoding)
+
+
+def _iter_mapped(buffer, size, encoding):
+    delimiter = b'\0' if buffer.find(b'\0') != -1 else b'\n'
+
+    start = 0
+    while start < size:
+        end = buffer.find(delimiter, start)
+        if end == -1:
+            end = size
+
+        token = _decode(buffer[start:end], delimiter, encoding)
+        if token is not None:
+            yield token
+
+        start = end + 1
+
+
+def _iter_stream(f, encoding):
+    delimiter = None
+    pending = b''
+
+    while True:
+        chunk = f.read(_chunk_size)
+        if not chunk:
+            break
+
+        # The format is detected with the first chunk
+        if delimiter is None:
+            delimiter = b'\0' if b'\0' in chunk else b'\n'
+
+        tokens = (pending + chunk).split(delimiter)
+        pending = tokens.pop()
+
+        for token in tokens:
+            token = _decode(token, delimiter, encoding)
+            if token is not None:
+                yield token
+
+    if pending:
+        token = _decode(pending, delimiter, encoding)
+        if token is not None:
+            yield token
+
+
+def _decode(token, delimiter, encoding):
+    # Empty lines are ignored in newline delimited files
+    if delimiter == b'\n':
+        token = token.rstrip(b'\r')
+        if not token:
+            return None
+
+    return token.decode(encoding, 'surrogateescape')
@@ -0,0 +1,107 @@
+import os
+import sys
+import pickle
+import hashlib
+import logging
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Pickle-backed on-disk cache, keyed by a stable hash of the objects the cached value is built from
+
+    Used for compiled definitions (see Sarge's 'cache_dir') and parsed config files (see ConfigLoader).
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    @staticmethod
+    def make_key(*objs, version):
+        """Return a hash of objs and the sargeparse version that is stable across processes, raise TypeError if
+        objs can't be hashed
+        """
+
+        key = stable_repr([
+            version,
+            '{}.{}'.format(*sys.version_info[:2]),
+            list(objs),
+        ])
+
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def load(self, key):
+        """Return the object cached under key, or None if it's missing or can't be loaded"""
+
+        path = self._get_path(key)
+
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+        except FileNotFoundError:
+            return None
+
+        except Exception:  # pylint: disable=broad-except
+            LOG.debug("Ignoring unreadable cache file '%s'", path, exc_info=True)
+            return None
+
+    def save(self, key, obj):
+        """Save obj under key, return False if obj can't be pickled or the file can't be written"""
+
+        try:
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            LOG.debug("Value can't be pickled, not caching it", exc_info=True)
+            return False
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # Write to a temporary file first so concurrent processes never read partial files
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+
+            os.replace(tmp_path, self._get_path(key))
+
+        except OSError:
+            LOG.debug("Unable to write cache file in '%s'", self.cache_dir, exc_info=True)
+            return False
+
+        return True
+
+    def _get_path(self, key):
+        return os.path.join(self.cache_dir, '{}.pickle'.format(key))
+
+
+def stable_repr(obj):
+    """Return a representation of obj that doesn't change across processes
+
+    Functions and classes are represented by their qualified name, so they must be defined at module level.
+    """
+
+    if isinstance(obj, dict):
+        items = sorted('{}: {}'.format(stable_repr(k), stable_repr(v)) for k, v in obj.items())
+        return '{{{}}}'.format(', '.join(items))
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = [stable_repr(v) for v in obj]
+        if isinstance(obj, (set, frozenset)):
+            items.sort()
+
+        return '{}({})'.format(type(obj).__name__, ', '.join(items))
+
+    if obj is None or isinstance(obj, (str, bytes, int, float, complex)):
+        return repr(obj)
+
+    if type(obj).__module__ == 'sargeparse.consts':
+        return '{}({})'.format(repr(obj), stable_repr(obj.value))
+
+    qualname = getattr(obj, '__qualname__', None)
+    module = getattr(obj, '__module__', None)
+    if callable(obj) and qualname and module and '<' not in qualname:
+        return '{}.{}'.format(module, qualname)
+
+    raise TypeError("Unable to make a stable representation of {!r}".format(obj))
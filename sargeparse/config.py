@@ -0,0 +1,157 @@
+import os
+import copy
+import logging
+import threading
+
+import sargeparse.consts
+
+LOG = logging.getLogger(__name__)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ConfigLoader:
+    """Callable for Sarge.parse(read_config=...) that reads a JSON, INI or TOML file
+
+    'path' can be a callable, it's called with the ArgumentData so the path can come from an argument. Parsed
+    files are cached in the process (and in 'cache_dir', if set) until their modification time or size change.
+    Missing files are read as an empty config, unless 'required' is True.
+    """
+
+    _formats = {
+        '.json': 'json',
+        '.ini': 'ini',
+        '.cfg': 'ini',
+        '.conf': 'ini',
+        '.toml': 'toml',
+    }
+
+    def __init__(self, path, *, file_format=None, required=False, cache_dir=None):
+        self.path = path
+        self.file_format = file_format
+        self.required = required
+        self._disk_cache = None
+
+        if cache_dir:
+            # Only imported when needed, it's not worth the import time otherwise
+            from sargeparse.cache import DiskCache
+            self._disk_cache = DiskCache(cache_dir)
+
+        if file_format is not None and file_format not in _loaders:
+            raise ValueError("Unsupported config file format: '{}'".format(file_format))
+
+    def __call__(self, data):
+        path = self.path(data) if callable(self.path) else self.path
+        if path in (None, sargeparse.unset):
+            return None
+
+        path = os.path.abspath(os.path.expanduser(path))
+        file_format = self.file_format or self._get_format(path)
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if self.required:
+                raise
+            return None
+
+        key = (path, stat.st_mtime_ns, stat.st_size, file_format)
+
+        with _cache_lock:
+            cached = _cache.get(path)
+
+        if cached is None or cached[0] != key:
+            cached = (key, self._load(key))
+            with _cache_lock:
+                _cache[path] = cached
+
+        # Callers may modify the config, the cached one must not change
+        return copy.deepcopy(cached[1])
+
+    def _get_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+
+        try:
+            return self._formats[extension]
+        except KeyError:
+            raise ValueError("Unable to guess the format of config file '{}'".format(path)) from None
+
+    def _load(self, key):
+        path, _, _, file_format = key
+
+        disk_cache_key = None
+        if self._disk_cache:
+            disk_cache_key = self._disk_cache.make_key('config', *key, version=sargeparse.__version__)
+            config = self._disk_cache.load(disk_cache_key)
+            if isinstance(config, dict):
+                return config
+
+        LOG.debug("Reading config file '%s'", path)
+        with open(path, 'rb') as f:
+            config = _loaders[file_format](f.read())
+
+        if self._disk_cache:
+            self._disk_cache.save(disk_cache_key, config)
+
+        return config
+
+
+def json_config(path, **kwargs):
+    return ConfigLoader(path, file_format='json', **kwargs)
+
+
+def ini_config(path, **kwargs):
+    return ConfigLoader(path, file_format='ini', **kwargs)
+
+
+def toml_config(path, **kwargs):
+    return ConfigLoader(path, file_format='toml', **kwargs)
+
+
+def clear_cache():
+    """Forget all the config files parsed in this process"""
+
+    with _cache_lock:
+        _cache.clear()
+
+
+# Parsers are imported when a file is loaded, they take a while to import
+def _load_json(content):
+    import json
+    return json.loads(content.decode('utf-8'))
+
+
+def _load_ini(content):
+    import configparser
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_string(content.decode('utf-8'))
+
+    return {section: dict(parser[section]) for section in parser.sections()}
+
+
+def _load_toml(content):
+    tomllib = _import_tomllib()
+    if tomllib is None:
+        raise ImportError("Reading TOML files requires Python >= 3.11, or the 'tomli' package")
+
+    return tomllib.loads(content.decode('utf-8'))
+
+
+def _import_tomllib():
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+
+    return tomllib
+
+
+_loaders = {
+    'json': _load_json,
+    'ini': _load_ini,
+    'toml': _load_toml,
+}
@@ -29,9 +29,22 @@ def _sentinel_factory(name):
         def __eq__(self, other):
             return isinstance(other, type(self))
 
+        def __reduce__(self):
+            return _get_sentinel, (name, self.value)
+
     return Sentinel()
 
 
+def _get_sentinel(name, value):
+    """Return the sentinel for name, used when unpickling sentinels"""
+
+    sentinel = globals()[name]
+    if value is None:
+        return sentinel
+
+    return sentinel(value)
+
+
 unset = _sentinel_factory('unset')
 stop = _sentinel_factory('stop')
 die = _sentinel_factory('die')
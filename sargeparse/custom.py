@@ -1,15 +1,248 @@
 import sys
+import copy
+import bisect
 import argparse
 import textwrap
+import collections.abc
 import shutil
+import threading
+
+_exit_mode = threading.local()
+
+# Namespace attribute where SubParsersAction records the names of the selected subcommands
+SUBCOMMAND_PATH_DEST = '_subcommand_path_'
+
+
+class ArgumentParserExit(Exception):
+    """Raised instead of printing and exiting when ArgumentParser runs inside raise_on_exit()"""
+
+    def __init__(self, status=0, message=None, *, output=''):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+        self.output = output
+
+
+class ArgumentParserError(ArgumentParserExit):
+    """Raised instead of ArgumentParser.error() printing the error and usage and exiting"""
+
+    def __init__(self, message, *, usage):
+        super().__init__(2, message)
+        self.usage = usage
+
+
+class raise_on_exit:  # pylint: disable=invalid-name
+    """Make ArgumentParser raise ArgumentParserExit instead of printing and exiting, in the current thread"""
+
+    def __init__(self):
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(_exit_mode, 'output', None)
+        _exit_mode.output = []
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _exit_mode.output = self._previous
 
 
 class ArgumentParser(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.register('action', 'parsers', SubParsersAction)
+        self._option_prefix_index = None
+
     def error(self, message):
+        if _raising_on_exit():
+            raise ArgumentParserError(message, usage=self.format_usage())
+
         print('error: {}\n\n'.format(message), file=sys.stderr, end='')
         self.print_usage()
         sys.exit(2)
 
+    def exit(self, status=0, message=None):
+        if _raising_on_exit():
+            output = ''.join(_exit_mode.output)
+            _exit_mode.output.clear()
+            raise ArgumentParserExit(status, message, output=output)
+
+        super().exit(status, message)
+
+    def _print_message(self, message, file=None):
+        if _raising_on_exit():
+            if message:
+                _exit_mode.output.append(message)
+            return
+
+        super()._print_message(message, file)
+
+    def _get_option_tuples(self, option_string):
+        # argparse scans every option string looking for the ones that start with option_string (or the part
+        # before '='), or that are its first 2 characters. Look them up in a sorted index instead, and let
+        # argparse pick from those, so the result (which changes across Python versions) is the same. argparse
+        # runs on a shallow copy of the parser, the parser itself can be in use by other threads
+        index = self._get_option_prefix_index()
+
+        prefix = option_string.split('=', 1)[0]
+        candidates = set(index.find_prefix(prefix))
+        if option_string[:2] in self._option_string_actions:
+            candidates.add(option_string[:2])
+
+        view = copy.copy(self)
+        view._option_string_actions = {
+            s: self._option_string_actions[s]
+            for s in sorted(candidates, key=index.order.get)
+        }
+
+        return super(ArgumentParser, view)._get_option_tuples(option_string)
+
+    def _get_option_prefix_index(self):
+        # Actions added to argument groups don't go through the parser's _add_action(), but all of them are added
+        # to _option_string_actions, and argparse never removes option strings without adding them again
+        index = self._option_prefix_index
+        if index is None or index.size != len(self._option_string_actions):
+            index = _OptionPrefixIndex(self._option_string_actions)
+            self._option_prefix_index = index
+
+        return index
+
+
+class _OptionPrefixIndex:
+    """Sorted option strings, to find the ones that start with a prefix by bisection"""
+
+    def __init__(self, option_string_actions):
+        self.size = len(option_string_actions)
+        self.order = {s: i for i, s in enumerate(option_string_actions)}
+        self.sorted = sorted(option_string_actions)
+
+    def find_prefix(self, prefix):
+        start = bisect.bisect_left(self.sorted, prefix)
+        end = start
+        while end < len(self.sorted) and self.sorted[end].startswith(prefix):
+            end += 1
+
+        return self.sorted[start:end]
+
+
+def _raising_on_exit():
+    return getattr(_exit_mode, 'output', None) is not None
+
+
+class SubParsersAction(argparse._SubParsersAction):  # pylint: disable=protected-access
+    """Subparsers action that can defer building a subparser until it's selected in the command line"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._lazy_choices_actions = None
+        self._prefix_registry = None
+        self._unregistered_names = []
+
+    def set_parser_map(self, parser_map, choices_actions):
+        """Look up subparsers in parser_map, a mapping of names and aliases to parsers that can build them on demand
+
+        choices_actions is called with the pseudo-action class the first time the subcommand list is needed (in
+        help), and must return the pseudo-actions of the subcommands in parser_map.
+        """
+
+        self._name_parser_map = parser_map
+        if self._prefix_registry is None:
+            self.choices = parser_map
+        self._lazy_choices_actions = choices_actions
+
+    def set_prefix_registry(self, registry):
+        """Also select subcommands by a unique prefix of their names or aliases, looked up in registry
+
+        Subparsers added with add_parser() that aren't in registry (like the help subcommand) make the prefixes
+        they start with ambiguous.
+        """
+
+        self._prefix_registry = registry
+        self._unregistered_names = [name for name in self._name_parser_map if registry.get(name) is None]
+        self.choices = _PrefixChoices(self)
+
+    def resolve_name(self, name):
+        """Return the subcommand name or alias selected by name, or None"""
+
+        if name in self._name_parser_map:
+            return name
+
+        if self._prefix_registry is None:
+            return None
+
+        if any(unregistered.startswith(name) for unregistered in self._unregistered_names):
+            return None
+
+        subparser = self._prefix_registry.get_by_prefix(name)
+        if subparser is None:
+            return None
+
+        return subparser.name
+
+    def add_parser(self, name, **kwargs):
+        parser = super().add_parser(name, **kwargs)
+
+        if self._prefix_registry is not None:
+            names = [name] + list(kwargs.get('aliases', ()))
+            self._unregistered_names.extend(n for n in names if self._prefix_registry.get(n) is None)
+
+        return parser
+
+    def make_parser(self, name, **kwargs):
+        """Create a subparser the same way add_parser() does, without adding it"""
+
+        kwargs = kwargs.copy()
+        kwargs.pop('help', None)
+        kwargs.pop('aliases', None)
+        if kwargs.get('prog') is None:
+            kwargs['prog'] = '{} {}'.format(self._prog_prefix, name)
+
+        return self._parser_class(**kwargs)
+
+    def get_parser(self, name):
+        """Return the subparser for name (or alias)"""
+
+        return self._name_parser_map[name]
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        # argparse has already checked that the name is in choices
+        if self._prefix_registry is not None:
+            values = [self.resolve_name(values[0])] + values[1:]
+
+        super().__call__(parser, namespace, values, option_string)
+
+        # Nested subcommands have already recorded their names (and they're copied to this namespace)
+        path = getattr(namespace, SUBCOMMAND_PATH_DEST, [])
+        setattr(namespace, SUBCOMMAND_PATH_DEST, [values[0]] + path)
+
+    def _get_subactions(self):
+        if self._lazy_choices_actions is not None:
+            with self._lock:
+                if self._lazy_choices_actions is not None:
+                    choices_actions = self._lazy_choices_actions(self._ChoicesPseudoAction)
+                    self._choices_actions[:0] = choices_actions
+                    self._lazy_choices_actions = None
+
+        return self._choices_actions
+
+
+class _PrefixChoices(collections.abc.Mapping):
+    """Choices of a SubParsersAction that also contain the unique prefixes of the subcommand names"""
+
+    def __init__(self, action):
+        self._action = action
+
+    def __getitem__(self, name):
+        return self._action._name_parser_map[name]  # pylint: disable=protected-access
+
+    def __contains__(self, name):
+        return self._action.resolve_name(name) is not None
+
+    def __iter__(self):
+        return iter(self._action._name_parser_map)  # pylint: disable=protected-access
+
+    def __len__(self):
+        return len(self._action._name_parser_map)  # pylint: disable=protected-access
+
 
 class HelpFormatter(argparse.HelpFormatter):
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+
+from sargeparse.custom import ArgumentParserExit, ArgumentParserError, raise_on_exit
+
+LOG = logging.getLogger(__name__)
+
+
+class CommandGateway:
+    """Run commands sent as JSON lines, parsed with a shared compiled Sarge and dispatched concurrently
+
+    Each request is a JSON object with 'argv' (a list of arguments) and an optional 'id', or just the list. The
+    response is a JSON line with the same 'id' and the exit 'status'. On success it also has the 'result' returned
+    by the callbacks, otherwise it has an 'error' object with its 'type' ('usage', 'exit', 'die', 'timeout',
+    'exception' or 'invalid_request') and 'message'. Responses are written as commands finish, so they can come
+    in any order.
+
+    At most 'max_concurrency' commands run at the same time, across all the connections, reading requests waits
+    while the limit is reached. Command lines are parsed in 'executor' (the event loop's default one if None), so
+    reading arguments files and config files doesn't block the event loop, and 'read_config' must be thread-safe.
+    Callbacks run in the event loop, see ArgumentData.dispatch_async(). 'obj' is shared by all the commands.
+    Arguments read from stdin ('stream') aren't supported, definitions with them raise TypeError.
+    """
+
+    def __init__(self, sarge, *, obj=None, read_config=None, max_concurrency=64, timeout=None, executor=None):
+        self.compiled = sarge.compile()
+        self.obj = obj
+        self.read_config = read_config
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.executor = executor
+
+        _check_unsupported_arguments(self.compiled._parser)
+
+        # Created when first used, so it belongs to the running event loop
+        self._semaphore = None
+
+    async def serve(self, reader, writer):
+        """Answer the requests read from a StreamReader, until EOF"""
+
+        semaphore = self._get_semaphore()
+        pending = set()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError as ex:
+                    # Line longer than the reader's limit, the rest of the stream can't be trusted
+                    self._write_response(writer, _make_error_response(None, 'invalid_request', str(ex), status=2))
+                    break
+
+                if not line:
+                    break
+
+                if not line.strip():
+                    continue
+
+                await semaphore.acquire()
+                task = asyncio.ensure_future(self._serve_request(line, writer))
+                task.add_done_callback(lambda _: semaphore.release())
+
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.wait(pending)
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def serve_unix(self, path, **kwargs):
+        """Start an asyncio.Server listening on a Unix socket, each connection is served with serve()"""
+
+        return await asyncio.start_unix_server(self._serve_connection, path, **kwargs)
+
+    async def serve_stdio(self):
+        """Serve the requests read from stdin, responses are written to stdout
+
+        Anything else written to stdout (like prints in callbacks) is sent to stderr, so it can't mix with them.
+        """
+
+        # get_running_loop() is new in Python 3.7
+        get_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+        loop = get_loop()
+
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        sys.stdout.flush()
+        stdout_fd = sys.stdout.fileno()
+        original_stdout = os.dup(stdout_fd)
+        responses = os.fdopen(os.dup(stdout_fd), 'wb')
+        os.dup2(sys.stderr.fileno(), stdout_fd)
+
+        try:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, responses)
+            writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+            try:
+                await self.serve(reader, writer)
+                await writer.drain()
+            finally:
+                writer.close()
+
+        finally:
+            # Give the process its stdout back
+            sys.stdout.flush()
+            os.dup2(original_stdout, stdout_fd)
+            os.close(original_stdout)
+
+    async def handle_request(self, request):
+        """Run a command, return its response (before encoding it)"""
+
+        request_id = None
+        if isinstance(request, dict):
+            request_id = request.get('id')
+            argv = request.get('argv')
+        else:
+            argv = request
+
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            return _make_error_response(request_id, 'invalid_request', "'argv' must be a list of strings", status=2)
+
+        try:
+            with raise_on_exit():
+                parsing = self.compiled.parse_async(argv, read_config=self.read_config, executor=self.executor)
+
+            data = await parsing
+
+        except ArgumentParserError as ex:
+            return _make_error_response(request_id, 'usage', ex.message, status=ex.status, usage=ex.usage)
+
+        except ArgumentParserExit as ex:
+            return _make_error_response(request_id, 'exit', ex.message, status=ex.status, output=ex.output)
+
+        except Exception as ex:  # pylint: disable=broad-except
+            # Like errors converting values, or reading the configuration
+            LOG.debug("Command %r couldn't be parsed", argv, exc_info=True)
+            return _make_exception_response(request_id, ex)
+
+        try:
+            result = await data.dispatch_async(obj=self.obj, timeout=self.timeout)
+
+        except SystemExit as ex:
+            code = ex.code
+            if code is None or isinstance(code, int):
+                return _make_error_response(request_id, 'die', None, status=code or 0)
+
+            return _make_error_response(request_id, 'die', str(code), status=1)
+
+        except asyncio.TimeoutError:
+            return _make_error_response(request_id, 'timeout', "Timed out after {} seconds".format(self.timeout))
+
+        except Exception as ex:  # pylint: disable=broad-except
+            LOG.debug("Command %r failed", argv, exc_info=True)
+            return _make_exception_response(request_id, ex)
+
+        return {
+            'id': request_id,
+            'status': 0,
+            'result': result,
+        }
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            await self.serve(reader, writer)
+            await writer.drain()
+
+        except ConnectionError:
+            LOG.debug("Gateway client disconnected", exc_info=True)
+
+        finally:
+            writer.close()
+
+    async def _serve_request(self, line, writer):
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except ValueError as ex:
+            response = _make_error_response(None, 'invalid_request', "Invalid JSON: {}".format(ex), status=2)
+        else:
+            response = await self.handle_request(request)
+
+        self._write_response(writer, response)
+
+        try:
+            await writer.drain()
+        except ConnectionError:
+            LOG.debug("Gateway client disconnected", exc_info=True)
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+    @staticmethod
+    def _write_response(writer, response):
+        # Values that can't be encoded in JSON (like sargeparse.unset) are sent as their repr()
+        line = json.dumps(response, default=repr) + '\n'
+        writer.write(line.encode('utf-8'))
+
+
+def _make_error_response(request_id, error_type, message, *, status=1, **details):
+    error = {
+        'type': error_type,
+        'message': message,
+    }
+    error.update(details)
+
+    return {
+        'id': request_id,
+        'status': status,
+        'error': error,
+    }
+
+
+def _check_unsupported_arguments(parser):
+    for argument in parser.arguments:
+        if argument.custom_parameters['stream']:
+            msg = "CommandGateway doesn't support arguments read from stdin ('stream'): '{}'"
+            raise TypeError(msg.format(argument.names[0]))
+
+    for subparser in parser.subparsers:
+        _check_unsupported_arguments(subparser)
+
+
+def _make_exception_response(request_id, ex):
+    # The traceback is only logged, it would expose the server's code to clients
+    return _make_error_response(request_id, 'exception', str(ex), exception=type(ex).__name__)
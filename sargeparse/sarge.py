@@ -1,26 +1,63 @@
 import sys
+import logging
+import argparse
+import threading
+import collections.abc
 
 import sargeparse.consts
 
+from sargeparse.argsfile import expand_argsfiles
 from sargeparse.context_manager import check_kwargs
-from sargeparse.custom import ArgumentParser
+from sargeparse.custom import ArgumentParser, ArgumentParserExit, ArgumentParserError, raise_on_exit
+from sargeparse.custom import _raising_on_exit
+from sargeparse.custom import SUBCOMMAND_PATH_DEST
 
 from sargeparse._parser import (
     Argument,
     ArgumentGroup,
     MutualExclussionGroup,
     ArgumentData,
+    FastMatcher,
     Parser,
 )
 
+LOG = logging.getLogger(__name__)
+
 
 def format_parser_data(arg_parser):
-    return {
-        'prog': arg_parser.prog,
-        'help': arg_parser.format_help(),
-        'usage': arg_parser.format_usage(),
+    return _ParserDataMapping(arg_parser)
+
+
+class _ParserDataMapping(collections.abc.Mapping):
+    """Parser 'prog', 'help' and 'usage', help and usage are rendered on first access and memoized"""
+
+    _formatters = {
+        'prog': lambda arg_parser: arg_parser.prog,
+        'help': lambda arg_parser: arg_parser.format_help(),
+        'usage': lambda arg_parser: arg_parser.format_usage(),
     }
 
+    def __init__(self, arg_parser):
+        self._arg_parser = arg_parser
+        self._values = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        value = self._formatters[key](self._arg_parser)
+        self._values[key] = value
+
+        return value
+
+    def __iter__(self):
+        return iter(self._formatters)
+
+    def __len__(self):
+        return len(self._formatters)
+
 
 class SubCommand:
     def __init__(self, definition, **kwargs):
@@ -35,6 +72,12 @@ class SubCommand:
             'subcommands': definition.pop('subcommands', []),
         }
 
+        self._parser = self._load_parser(definition)
+
+    def _load_parser(self, definition):
+        return self._build_parser(definition)
+
+    def _build_parser(self, definition):
         self._parser = Parser(
             definition,
             show_warnings=self._show_warnings,
@@ -44,6 +87,8 @@ class SubCommand:
         self.add_arguments(*self._custom_parameters['arguments'])
         self.add_subcommands(*self._custom_parameters['subcommands'])
 
+        return self._parser
+
     def _add_subcommand_definition(self, definition):
         subcommand = SubCommand(
             definition,
@@ -55,6 +100,12 @@ class SubCommand:
         self._parser.add_subparsers(subcommand._parser)
         return subcommand
 
+    @property
+    def argument_index(self):
+        """Arguments of this command partitioned by global, positional, group and mutex_group"""
+
+        return self._parser.argument_index
+
     def add_arguments(self, *definitions):
         self._parser.add_arguments(*definitions)
 
@@ -119,6 +170,13 @@ class SubCommand:
 
 class Sarge(SubCommand):
     def __init__(self, definition, **kwargs):
+        self._definition_cache = None
+        self._definition_cache_key = None
+
+        cache_dir = kwargs.pop('cache_dir', None)
+        if cache_dir:
+            self._setup_definition_cache(cache_dir, definition, kwargs)
+
         definition = definition.copy()
 
         self._custom_parameters = {
@@ -127,97 +185,94 @@ class Sarge(SubCommand):
 
         self.help_subcommand = self._custom_parameters['help_subcommand']
 
+        precedence = kwargs.pop('precedence', None)
+        self._lazy_subcommands = kwargs.pop('lazy_subcommands', False)
+        self._fast_path = kwargs.pop('fast_path', True)
+        self._single_pass = kwargs.pop('single_pass', False)
+        self._skip_shadowed = kwargs.pop('skip_shadowed', False)
+        self._abbrev_subcommands = kwargs.pop('abbrev_subcommands', False)
+        self._argsfile_prefix = kwargs.pop('argsfile_prefix', None)
+
         kwargs['_main_command'] = True
         super().__init__(definition, **kwargs)
 
-        precedence = kwargs.pop('precedence', None)
-        self._data = ArgumentData(self._parser, precedence)
+        self._precedence = ArgumentData.validate_precedence(precedence)
+        self._compiled = None
+        self._compile_lock = threading.Lock()
 
     def parse(self, argv=None, read_config=None):
-        argv = argv or sys.argv[1:]
-
-        self._data.clear_all()
+        return self.compile().parse(argv, read_config=read_config)
 
-        cli_args, parser_data = self._parse_cli_arguments(argv)
-        self._data.parser_data = parser_data
+    def parse_many(self, argvs, read_config=None):
+        return self.compile().parse_many(argvs, read_config=read_config)
 
-        self._data.cli.update(cli_args)
-        self._data._remove_unset_from_data_sources_cli()
-        self._data._move_defaults_from_data_sources_cli()
+    def parse_async(self, argv=None, read_config=None, *, executor=None):
+        return self.compile().parse_async(argv, read_config=read_config, executor=executor)
 
-        self._data._parse_envvars_and_defaults()
+    def compile(self):
+        """Return a CompiledSarge for the current definition, it's only built again if the definition changes"""
 
-        # Config callback
-        if read_config:
-            config = self._call_read_config(read_config)
-            self._data._parse_config(config)
+        compiled = self._compiled
+        if compiled is not None and compiled.revision == self._parser.revision:
+            return compiled
 
-        self._data._parse_callbacks()
-        self._data._remove_parser_key_from_data_sources_cli()
+        with self._compile_lock:
+            compiled = self._compiled
+            if compiled is None or compiled.revision != self._parser.revision:
+                compiled = self._make_compiled()
+                self._compiled = compiled
 
-        return self._data
+        return compiled
 
     @classmethod
     def decorator(cls, definition, **kwargs):
         return cls._decorator(cls, definition, kwargs)
 
-    def _call_read_config(self, read_config):
-        if not callable(read_config):
-            raise TypeError("'read_config' is not callable")
+    def _setup_definition_cache(self, cache_dir, definition, kwargs):
+        # Only imported when needed, it's not worth the import time otherwise
+        from sargeparse.cache import DiskCache
 
-        config = read_config(self._data)
-        if config is None:
-            config = {}
+        show_warnings = kwargs.get('show_warnings', True)
 
-        if not isinstance(config, dict):
-            msg = "read_config returned a {} when a dict (or None) was expected"
-            raise TypeError(msg.format(type(config)))
-
-        return config
-
-    def _parse_cli_arguments(self, argv):
-        argument_parser_kwargs = self._parser.argument_parser_kwargs.copy()
-        argument_parser_kwargs['argument_default'] = sargeparse.unset
+        try:
+            key = DiskCache.make_key(definition, show_warnings, version=sargeparse.__version__)
+        except TypeError as ex:
+            if show_warnings:
+                LOG.warning("Definition won't be cached: %s", ex)
+            return
 
-        # Create ArgumentParser instance and initialize
-        ap = ArgumentParser(**argument_parser_kwargs)
-        apw = _ArgumentParserWrapper(ap)
-        apw.set_defaults(**self._parser.get_set_default_kwargs())
+        self._definition_cache = DiskCache(cache_dir)
+        self._definition_cache_key = key
 
-        # Add global arguments first
-        global_arguments = self._parser.compile_argument_list({'global': True})
-        apw.add_arguments(*global_arguments)
+    def _load_parser(self, definition):
+        if not self._definition_cache:
+            return super()._load_parser(definition)
 
-        # Replace help subcommand by --help at the end, makes it possible to use:
-        # command help, command help subcommand, command help subcommand subsubcommand...
-        if self._parser.subparsers and self.help_subcommand and argv and argv[0] == 'help':
-            argv.pop(0)
-            argv.append('--help')
+        parser = self._definition_cache.load(self._definition_cache_key)
+        if isinstance(parser, Parser):
+            return parser
 
-        # Parse global options first so they can be placed anywhere, unless the --help/-h flag is set
-        parsed_args, rest = None, argv
-        if '-h' not in rest and '--help' not in rest:
-            parsed_args, rest = apw.parse_known_args(rest)
+        parser = super()._load_parser(definition)
+        self._definition_cache.save(self._definition_cache_key, parser)
 
-        # Add the rest of arguments
-        arguments = self._parser.compile_argument_list({'global': False})
-        apw.add_arguments(*arguments)
+        return parser
 
-        # Add subcommands
-        parser_data = apw.add_subcommands(
-            *self._parser.subparsers,
-            add_subparsers_kwargs=self._parser.add_subparsers_kwargs
-        )
+    def _make_compiled(self):
+        help_subparser = None
         if self._parser.subparsers and self.help_subcommand:
-            apw.add_subcommands(self._make_help_subparser(), add_subparsers_kwargs={})
-
-        # Finish parsing args
-        parsed_args = apw.parse_args(rest, parsed_args)
-
-        # Add parser data
-        parser_data[self._parser.parser_key()] = format_parser_data(ap)
-
-        return parsed_args.__dict__, parser_data
+            help_subparser = self._make_help_subparser()
+
+        return CompiledSarge(
+            self._parser,
+            help_subparser=help_subparser,
+            lazy=self._lazy_subcommands,
+            fast_path=self._fast_path,
+            single_pass=self._single_pass,
+            skip_shadowed=self._skip_shadowed,
+            abbrev_subcommands=self._abbrev_subcommands,
+            argsfile_prefix=self._argsfile_prefix,
+            precedence=self._precedence,
+        )
 
     def _make_help_subparser(self):
         parser = Parser(
@@ -235,6 +290,283 @@ class Sarge(SubCommand):
         return parser
 
 
+class CompiledSarge:
+    """Compiled Sarge definition, can be shared between threads
+
+    It must not be modified after it's built, every call to parse() returns a new ArgumentData instance.
+
+    With single_pass=True, hidden copies of the global arguments are added to every subcommand, so the command
+    line is parsed once instead of parsing the global arguments first. The result is the same, except that:
+      - a subcommand argument with the same name as a global argument takes precedence after that subcommand
+      - an abbreviated global option can be ambiguous with the other options of the subcommand it's placed in
+      - a global option can't be placed between an option and its value, like '--level' in '--name --level 1 x'
+    Definitions with global arguments that are required, in a mutex group, or whose action accumulates values
+    (like 'count' or 'append') can't be parsed in a single pass, they use the two passes.
+
+    With abbrev_subcommands=True, subcommands can also be selected by a unique prefix of their names or aliases,
+    like 'rem' for 'remove'. The prefixes of 'help' are ambiguous when there's a help subcommand.
+    """
+
+    _single_pass_unsupported_actions = ('count', 'append', 'append_const', 'extend')
+
+    def __init__(self, parser, *, help_subparser, lazy, fast_path, precedence, single_pass=False,
+                 skip_shadowed=False, abbrev_subcommands=False, argsfile_prefix=None):
+        self.revision = parser.revision
+        self.precedence = precedence
+        self.skip_shadowed = skip_shadowed
+
+        # Arguments starting with the prefix are replaced by the arguments in the file, see expand_argsfiles()
+        self.argsfile_prefix = argsfile_prefix
+        self._parser = parser
+
+        self.has_help_subcommand = help_subparser is not None
+
+        argument_parser_kwargs = parser.argument_parser_kwargs.copy()
+        argument_parser_kwargs['argument_default'] = sargeparse.unset
+
+        global_arguments = list(parser.compile_argument_list({'global': True}))
+
+        # Global arguments are added to every subcommand when parsing in a single pass
+        single_pass_arguments = parser.argument_index.select({'global': True})
+        self.single_pass = single_pass and self._is_single_pass_supported(single_pass_arguments)
+
+        # Matches simple command lines without argparse, if the definition allows it. It places global arguments
+        # like two passes do, so it's not used when parsing in a single pass
+        self.fast_matcher = None
+        if fast_path and not self.single_pass:
+            fast_matcher = FastMatcher(parser)
+            if fast_matcher.supported:
+                self.fast_matcher = fast_matcher
+
+        # Parser with only the global arguments, used to parse them first so they can be placed anywhere
+        self.global_parser = _ArgumentParserWrapper(ArgumentParser(**argument_parser_kwargs))
+        self.global_parser.set_defaults(**parser.get_set_default_kwargs())
+        self.global_parser.add_arguments(*global_arguments)
+
+        # Parser with all the arguments (global ones first) and subcommands
+        self.parser = _ArgumentParserWrapper(ArgumentParser(**argument_parser_kwargs))
+        self.parser.set_defaults(**parser.get_set_default_kwargs())
+        self.parser.add_arguments(*global_arguments)
+        self.parser.add_arguments(*parser.compile_argument_list({'global': False}))
+
+        self.parser_data = self.parser.add_subcommands(
+            parser.subparsers,
+            add_subparsers_kwargs=parser.add_subparsers_kwargs,
+            lazy=lazy,
+            abbrev=abbrev_subcommands,
+            global_arguments=single_pass_arguments if self.single_pass else (),
+        )
+        if self.has_help_subcommand:
+            self.parser.add_subcommands(
+                [help_subparser],
+                add_subparsers_kwargs={},
+                global_arguments=single_pass_arguments if self.single_pass else (),
+            )
+
+        self.parser_data[parser.parser_key()] = format_parser_data(self.parser.parser)
+
+    def parse(self, argv=None, read_config=None):
+        if argv is None:
+            argv = sys.argv[1:]
+
+        data = ArgumentData(self._parser, self.precedence, skip_shadowed=self.skip_shadowed, read_config=read_config)
+
+        cli_args, subcommands = self._parse_cli_arguments(argv)
+        data._set_active_path(subcommands)
+        data.parser_data = self.parser_data
+
+        data.cli.update(cli_args)
+        data._remove_unset_from_data_sources_cli()
+        data._move_defaults_from_data_sources_cli()
+
+        data._parse_envvars_and_defaults()
+        data._parse_streams()
+
+        # Config callback
+        if read_config:
+            data._parse_config(data._call_read_config(), data.configuration)
+
+        data._parse_deferred_defaults()
+
+        data._parse_callbacks()
+        data._remove_parser_key_from_data_sources_cli()
+
+        return data
+
+    def parse_many(self, argvs, read_config=None):
+        """Parse every argv in argvs, yield a ParseResult for each one
+
+        Parsing errors, --help and similar don't print anything or exit, they're returned in the results.
+        """
+
+        for index, argv in enumerate(argvs):
+            try:
+                with raise_on_exit():
+                    data = self.parse(argv, read_config=read_config)
+
+            except ArgumentParserExit as ex:
+                yield ParseResult(index, argv, exception=ex)
+
+            else:
+                yield ParseResult(index, argv, data=data)
+
+    def parse_async(self, argv=None, read_config=None, *, executor=None):
+        """Return an awaitable with the result of parse(), which runs in 'executor' (the event loop's default one if
+        None) so reading streams and config files doesn't block the event loop
+
+        It must be called with an event loop running. If it's called inside raise_on_exit(), parse() also runs
+        inside raise_on_exit().
+        """
+
+        # asyncio takes a while to import, it's only imported when used
+        import asyncio
+
+        # get_running_loop() is new in Python 3.7
+        get_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+        loop = get_loop()
+        return loop.run_in_executor(executor, self._parse_in_executor, argv, read_config, _raising_on_exit())
+
+    def _parse_in_executor(self, argv, read_config, raising_on_exit):
+        if not raising_on_exit:
+            return self.parse(argv, read_config=read_config)
+
+        with raise_on_exit():
+            return self.parse(argv, read_config=read_config)
+
+    def _parse_cli_arguments(self, argv):
+        """Return the parsed values, and the names of the selected subcommands"""
+
+        # Work on a copy, the caller's list must not be modified
+        if self.argsfile_prefix:
+            try:
+                argv = list(expand_argsfiles(argv, self.argsfile_prefix))
+            except OSError as ex:
+                self.parser.parser.error("can't read arguments file: {}".format(ex))
+        else:
+            argv = list(argv)
+
+        # Replace help subcommand by --help at the end, makes it possible to use:
+        # command help, command help subcommand, command help subcommand subsubcommand...
+        if self.has_help_subcommand and argv and argv[0] == 'help':
+            argv.pop(0)
+            argv.append('--help')
+
+        if self.fast_matcher:
+            match = self.fast_matcher.match(argv)
+            if match:
+                values, subcommands = match
+
+                # Make sure parsers (and parser data) exist for the subcommands, in case they're built lazily
+                self.parser.get_subparser(*subcommands)
+
+                return values, subcommands
+
+        if self.single_pass:
+            parsed_args = self.parser.parse_args(argv)
+            return parsed_args.__dict__, parsed_args.__dict__.pop(SUBCOMMAND_PATH_DEST, [])
+
+        # Parse global options first so they can be placed anywhere, unless the --help/-h flag is set
+        parsed_args, rest = None, argv
+        if '-h' not in rest and '--help' not in rest:
+            parsed_args, rest = self.global_parser.parse_known_args(rest)
+
+        # Finish parsing args
+        parsed_args = self.parser.parse_args(rest, parsed_args)
+
+        return parsed_args.__dict__, parsed_args.__dict__.pop(SUBCOMMAND_PATH_DEST, [])
+
+    @classmethod
+    def _is_single_pass_supported(cls, global_arguments):
+        for argument in global_arguments:
+            kwargs = argument.add_argument_kwargs
+            if kwargs.get('required') or argument.mutex_group or \
+                    kwargs.get('action') in cls._single_pass_unsupported_actions:
+                LOG.debug("Global argument '%s' can't be parsed in a single pass", argument.dest)
+                return False
+
+        return True
+
+
+class ParseResult:
+    """Result of parsing one argv with parse_many(): 'data' if it was parsed, or the exit status and messages"""
+
+    def __init__(self, index, argv, *, data=None, exception=None):
+        self.index = index
+        self.argv = argv
+        self.data = data
+        self.status = None
+        self.error = None
+        self.usage = None
+        self.output = None
+
+        if exception is not None:
+            self.status = exception.status
+            self.output = exception.output
+
+            if isinstance(exception, ArgumentParserError):
+                self.error = exception.message
+                self.usage = exception.usage
+
+    @property
+    def ok(self):
+        return self.status is None
+
+    def __repr__(self):
+        if self.ok:
+            return '<ParseResult {} ok>'.format(self.index)
+
+        return '<ParseResult {} status={} error={!r}>'.format(self.index, self.status, self.error)
+
+
+class _LazyParserMap(collections.abc.MutableMapping):
+    """Subcommand names and aliases to argparse parsers, backed by a SubcommandRegistry
+
+    Parsers are built the first time they're looked up, parsers added with argparse's add_parser() (like the
+    help subcommand) are kept apart.
+    """
+
+    def __init__(self, registry, build):
+        self._registry = registry
+        self._build = build
+        self._parsers = {}
+        self._extra = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        if name in self._extra:
+            return self._extra[name]
+
+        subparser = self._registry.get(name)
+        if subparser is None:
+            raise KeyError(name)
+
+        parser = self._parsers.get(subparser.name)
+        if parser is None:
+            with self._lock:
+                parser = self._parsers.get(subparser.name)
+                if parser is None:
+                    parser = self._build(subparser)
+                    self._parsers[subparser.name] = parser
+
+        return parser
+
+    def __setitem__(self, name, parser):
+        self._extra[name] = parser
+
+    def __delitem__(self, name):
+        del self._extra[name]
+
+    def __contains__(self, name):
+        return name in self._extra or self._registry.get(name) is not None
+
+    def __iter__(self):
+        yield from self._registry.names()
+        yield from self._extra
+
+    def __len__(self):
+        return len(self._registry.names()) + len(self._extra)
+
+
 class _ArgumentParserWrapper:
     def __init__(self, parser):
         self.parser = parser
@@ -274,38 +606,138 @@ class _ArgumentParserWrapper:
         if has_mutex_group:
             add_argument_kwargs.pop('required', None)
 
+        # Streamed values are converted as they're read
+        if argument.custom_parameters['stream']:
+            add_argument_kwargs.pop('type', None)
+
         dest.add_argument(
             *argument.names,
             **add_argument_kwargs
         )
 
-    def add_subcommands(self, *subparsers, add_subparsers_kwargs):
-        parser_data = {}
+    def add_subcommands(self, subparsers, *, add_subparsers_kwargs, lazy=False, abbrev=False, parser_data=None,
+                        global_arguments=()):
+        """Add subparsers recursively and return their parser data, keyed by parser key
 
-        for subparser in subparsers:
+        With lazy=True, subparsers must be a SubcommandRegistry. Subparsers are looked up in it when they are
+        selected in the command line, and are built (along with their parser data) only then. Subparsers that
+        must add their usage to the parent's description are always built.
+
+        With abbrev=True, subparsers must be a SubcommandRegistry too, and subcommands can also be selected by a
+        unique prefix of their names or aliases.
+
+        Hidden copies of global_arguments are added to every subparser, see CompiledSarge.
+        """
+
+        if parser_data is None:
+            parser_data = {}
+
+        if not subparsers:
+            return parser_data
 
-            self.setup_subparsers(**add_subparsers_kwargs)
+        self.setup_subparsers(**add_subparsers_kwargs)
 
+        if lazy:
+            self.add_lazy_subcommands(
+                subparsers,
+                abbrev=abbrev,
+                parser_data=parser_data,
+                global_arguments=global_arguments,
+            )
+        else:
+            self.add_eager_subcommands(
+                subparsers,
+                abbrev=abbrev,
+                parser_data=parser_data,
+                global_arguments=global_arguments,
+            )
+
+        if abbrev:
+            self.get_subparsers_obj().set_prefix_registry(subparsers)
+
+        return parser_data
+
+    def add_eager_subcommands(self, subparsers, *, abbrev, parser_data, global_arguments=()):
+        for subparser in subparsers:
             new_parser = self.add_parser(
                 subparser.name,
                 **subparser.argument_parser_kwargs
             )
 
-            new_parser.set_defaults(**subparser.get_set_default_kwargs())
+            new_parser.setup_subparser(
+                subparser,
+                lazy=False,
+                abbrev=abbrev,
+                parser_data=parser_data,
+                global_arguments=global_arguments,
+            )
+
+            self._add_subcommand_usage_to_description(subparser, new_parser)
 
-            arguments = subparser.compile_argument_list()
-            new_parser.add_arguments(*arguments)
+    def setup_subparser(self, subparser, *, lazy, abbrev=False, parser_data, global_arguments=()):
+        self.set_defaults(**subparser.get_set_default_kwargs())
 
-            parser_data.update(new_parser.add_subcommands(
-                *subparser.subparsers,
-                add_subparsers_kwargs=subparser.add_subparsers_kwargs
-            ))
+        arguments = subparser.compile_argument_list()
+        self.add_arguments(*arguments)
+        self.add_global_argument_copies(*global_arguments)
 
-            self._add_subcommand_usage_to_description(subparser, new_parser)
+        self.add_subcommands(
+            subparser.subparsers,
+            add_subparsers_kwargs=subparser.add_subparsers_kwargs,
+            lazy=lazy,
+            abbrev=abbrev,
+            parser_data=parser_data,
+            global_arguments=global_arguments,
+        )
 
-            parser_data[subparser.parser_key()] = format_parser_data(new_parser.parser)
+        parser_data[subparser.parser_key()] = format_parser_data(self.parser)
 
-        return parser_data
+    def add_lazy_subcommands(self, registry, *, abbrev, parser_data, global_arguments=()):
+        subparsers_obj = self.get_subparsers_obj()
+
+        def build(subparser):
+            new_parser = subparsers_obj.make_parser(subparser.name, **subparser.argument_parser_kwargs)
+            _ArgumentParserWrapper(new_parser).setup_subparser(
+                subparser,
+                lazy=True,
+                abbrev=abbrev,
+                parser_data=parser_data,
+                global_arguments=global_arguments,
+            )
+            return new_parser
+
+        def choices_actions(action_class):
+            return [
+                action_class(
+                    subparser.name,
+                    tuple(subparser.argument_parser_kwargs.get('aliases', ())),
+                    subparser.argument_parser_kwargs['help'],
+                )
+                for subparser in registry
+                if 'help' in subparser.argument_parser_kwargs
+            ]
+
+        parser_map = _LazyParserMap(registry, build)
+        subparsers_obj.set_parser_map(parser_map, choices_actions)
+
+        for subparser in registry:
+            if subparser.add_usage_to_parent_command_desc:
+                new_parser = _ArgumentParserWrapper(parser_map[subparser.name])
+                self._add_subcommand_usage_to_description(subparser, new_parser)
+
+    def add_global_argument_copies(self, *global_arguments):
+        """Add global arguments hidden, and without a default so they don't replace values parsed before"""
+
+        for argument in global_arguments:
+            names = [name for name in argument.names if name not in self.parser._option_string_actions]
+            if not names:
+                continue
+
+            add_argument_kwargs = argument.add_argument_kwargs.copy()
+            add_argument_kwargs['default'] = argparse.SUPPRESS
+            add_argument_kwargs['help'] = argparse.SUPPRESS
+
+            self.parser.add_argument(*names, **add_argument_kwargs)
 
     def _add_subcommand_usage_to_description(self, subparser, new_parser):
         if not subparser.add_usage_to_parent_command_desc:
@@ -320,6 +752,15 @@ class _ArgumentParserWrapper:
 
         self.parser.description += '  ' + new_parser.parser.format_usage()[7:]
 
+    def get_subparser(self, *names):
+        """Return the wrapped subparser at the end of the path of subcommand names"""
+
+        wrapper = self
+        for name in names:
+            wrapper = _ArgumentParserWrapper(wrapper.get_subparsers_obj().get_parser(name))
+
+        return wrapper
+
     def get_subparsers_obj(self):
         return self.parser._subparsers._group_actions[0]
 
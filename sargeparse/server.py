@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import array
+import errno
+import socket
+import logging
+import threading
+import traceback
+
+# The protocol is defined along with the client, see sargeparse_client
+from sargeparse_client import LENGTH, INT, STD_FDS, recv_exactly
+
+LOG = logging.getLogger(__name__)
+
+_max_request_size = 16 * 1024 * 1024
+
+
+class CommandServer:
+    """Fork server that keeps a compiled Sarge warm, and runs the commands sent with sargeparse_client.run_client()
+    (Unix only)
+
+    Each request is run in a worker forked from the server, so the definition, and the modules imported before
+    serve_forever() is called, are already loaded. The worker takes the client's stdin, stdout, stderr, argv,
+    environment and working directory, parses the command line and dispatches the callbacks, and sends back
+    the exit status. If the worker is killed by a signal, the status is 128 + the signal number, like shells
+    report it. Only the user running the server can connect to its socket.
+    """
+
+    def __init__(self, sarge, path, *, obj=None, read_config=None, backlog=128, poll_interval=0.5,
+                 request_timeout=10):
+        self.compiled = sarge.compile()
+        self.path = path
+        self.obj = obj
+        self.read_config = read_config
+        self.backlog = backlog
+        self.poll_interval = poll_interval
+
+        # Seconds a worker waits for the request, before giving up on the client
+        self.request_timeout = request_timeout
+
+        self._socket = None
+
+        # Connection of every running worker, by pid
+        self._workers = {}
+        self._shutdown = threading.Event()
+
+    def __enter__(self):
+        self.bind()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback_):
+        self.close()
+
+    def bind(self):
+        """Listen on the socket path, replacing stale sockets left by servers that didn't exit cleanly"""
+
+        if self._socket is not None:
+            return
+
+        self._remove_stale_socket()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(previous_umask)
+
+        sock.listen(self.backlog)
+        sock.settimeout(self.poll_interval)
+        self._socket = sock
+
+    def serve_forever(self):
+        """Fork a worker for each request, until shutdown() is called"""
+
+        self.bind()
+        self._shutdown.clear()
+
+        while not self._shutdown.is_set():
+            self._reap_workers()
+
+            try:
+                conn, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+
+            conn.settimeout(None)
+            self._fork_worker(conn)
+
+    def shutdown(self):
+        """Make serve_forever() return, running workers aren't stopped"""
+
+        self._shutdown.set()
+
+    def close(self):
+        if self._socket is None:
+            return
+
+        self._socket.close()
+        self._socket = None
+
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+        self._reap_workers()
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.path)
+            except ConnectionRefusedError:
+                LOG.debug("Removing stale socket '%s'", self.path)
+                os.unlink(self.path)
+                return
+
+        raise OSError(errno.EADDRINUSE, "A command server is already listening on '{}'".format(self.path))
+
+    def _reap_workers(self):
+        for pid, conn in list(self._workers.items()):
+            try:
+                finished, wait_status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished, wait_status = pid, 0
+
+            if not finished:
+                continue
+
+            del self._workers[pid]
+
+            with conn:
+                # The worker couldn't send the exit status itself
+                if os.WIFSIGNALED(wait_status):
+                    self._send_signal_status(conn, os.WTERMSIG(wait_status))
+
+    @staticmethod
+    def _send_signal_status(conn, signum):
+        try:
+            conn.sendall(INT.pack(128 + signum))
+        except OSError:
+            LOG.debug("Command server client disconnected", exc_info=True)
+
+    def _fork_worker(self, conn):
+        # Anything buffered would be written by the worker too
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        try:
+            pid = os.fork()
+        except OSError:
+            conn.close()
+            raise
+
+        if pid:
+            # The connection is kept open, to send the exit status if the worker is killed
+            LOG.debug("Forked command server worker %d", pid)
+            self._workers[pid] = conn
+            return
+
+        try:
+            self._socket.close()
+            for worker_conn in self._workers.values():
+                worker_conn.close()
+
+            conn.sendall(INT.pack(os.getpid()))
+
+            conn.settimeout(self.request_timeout)
+            request, fds = _recv_request(conn)
+            conn.settimeout(None)
+
+            status = self._run_worker(request, fds)
+            conn.sendall(INT.pack(status))
+
+        except (ConnectionError, socket.timeout):
+            LOG.debug("Command server client disconnected", exc_info=True)
+
+        except BaseException:  # pylint: disable=broad-except
+            traceback.print_exc()
+
+        finally:
+            os._exit(0)  # pylint: disable=protected-access
+
+    def _run_worker(self, request, fds):
+        for fd, std_fd in zip(fds, STD_FDS):
+            os.dup2(fd, std_fd)
+            os.close(fd)
+
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        sys.argv[1:] = request['argv']
+
+        # The server's streams may have been replaced, these are the client's
+        previous = sys.stdin, sys.stdout, sys.stderr
+        with _open_std_stream(0, 'r', sys.__stdin__) as stdin, \
+                _open_std_stream(1, 'w', sys.__stdout__) as stdout, \
+                _open_std_stream(2, 'w', sys.__stderr__) as stderr:
+
+            sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+            try:
+                return self._run_command(request['argv'])
+            finally:
+                sys.stdin, sys.stdout, sys.stderr = previous
+
+    def _run_command(self, argv):
+        try:
+            data = self.compiled.parse(argv, read_config=self.read_config)
+            data.dispatch(obj=self.obj)
+
+        except SystemExit as ex:
+            return _get_exit_status(ex.code)
+
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc()
+            return 1
+
+        return 0
+
+
+def _recv_request(conn):
+    fds = array.array('i')
+    message, ancdata, flags, _ = conn.recvmsg(LENGTH.size, socket.CMSG_SPACE(len(STD_FDS) * fds.itemsize))
+
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - len(data) % fds.itemsize])
+
+    if flags & socket.MSG_CTRUNC or len(fds) != len(STD_FDS):
+        for fd in fds:
+            os.close(fd)
+        raise ValueError("Expected {} file descriptors in the request".format(len(STD_FDS)))
+
+    length, = LENGTH.unpack(message + recv_exactly(conn, LENGTH.size - len(message)))
+    if length > _max_request_size:
+        raise ValueError("Request too large: {} bytes".format(length))
+
+    request = json.loads(recv_exactly(conn, length).decode('utf-8'))
+
+    return request, list(fds)
+
+
+def _get_exit_status(code):
+    # Same as the interpreter does with SystemExit
+    if code is None:
+        return 0
+
+    if isinstance(code, int):
+        return code
+
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _open_std_stream(fd, mode, original):
+    # Same encoding and error handler as the interpreter's own stream
+    return open(  # pylint: disable=consider-using-with
+        fd, mode,
+        encoding=getattr(original, 'encoding', None) or 'utf-8',
+        errors=getattr(original, 'errors', None) or 'strict',
+        closefd=False,
+    )
@@ -0,0 +1,94 @@
+"""Client of sargeparse.server.CommandServer
+
+It's kept apart from the sargeparse package, so the shim that runs commands in the server only imports this module:
+    python -m sargeparse_client SOCKET_PATH [ARGUMENT...]
+"""
+import os
+import sys
+import json
+import array
+import signal
+import socket
+import struct
+import threading
+
+# Requests are a length-prefixed JSON object, sent along with the client's stdin, stdout and stderr. The worker
+# replies with its pid, so the client can forward signals to it, and then with the exit status. If the worker is
+# killed by a signal, the server replies with 128 + the signal number instead
+LENGTH = struct.Struct('!I')
+INT = struct.Struct('!i')
+
+STD_FDS = (0, 1, 2)
+FORWARDED_SIGNALS = ('SIGINT', 'SIGTERM', 'SIGHUP', 'SIGQUIT')
+
+
+def run_client(path, argv=None, *, env=None, cwd=None, fds=STD_FDS):
+    """Run a command in the CommandServer listening on path, and return its exit status
+
+    argv, env and cwd default to the ones of the current process, and fds to its stdin, stdout and stderr. While
+    the command runs, SIGINT, SIGTERM, SIGHUP and SIGQUIT are forwarded to the worker.
+    """
+
+    request = {
+        'argv': sys.argv[1:] if argv is None else list(argv),
+        'env': dict(os.environ) if env is None else dict(env),
+        'cwd': os.getcwd() if cwd is None else cwd,
+    }
+    payload = json.dumps(request).encode('utf-8')
+    message = LENGTH.pack(len(payload)) + payload
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+
+        sent = sock.sendmsg([message], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))])
+        sock.sendall(message[sent:])
+
+        pid, = INT.unpack(recv_exactly(sock, INT.size))
+
+        with _forward_signals(pid):
+            status, = INT.unpack(recv_exactly(sock, INT.size))
+
+    return status
+
+
+def recv_exactly(sock, size):
+    data = b''
+
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed before the whole message was received")
+
+        data += chunk
+
+    return data
+
+
+class _forward_signals:  # pylint: disable=invalid-name
+    def __init__(self, pid):
+        self._pid = pid
+        self._previous = {}
+
+    def __enter__(self):
+        # Signal handlers can only be set in the main thread
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        for name in FORWARDED_SIGNALS:
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                self._previous[signum] = signal.signal(signum, self._forward)
+
+    def __exit__(self, exc_type, exc_value, traceback_):
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)
+
+    def _forward(self, signum, _):
+        try:
+            os.kill(self._pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+if __name__ == '__main__':
+    sys.exit(run_client(sys.argv[1], sys.argv[2:]))
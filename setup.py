@@ -34,6 +34,7 @@ setup(
     url=package.__url__,
     version=package.__version__,
     packages=find_packages(),
+    py_modules=['sargeparse_client'],
     include_package_data=True,
     install_requires=install_reqs,
     cmdclass={'test': CustomTestCommand},
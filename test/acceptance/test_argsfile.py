@@ -0,0 +1,71 @@
+import sys
+import shlex
+
+import pytest
+
+import sargeparse
+from sargeparse.argsfile import iter_argsfile
+
+
+def make_parser(argsfile_prefix='@'):
+    return sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--debug'],
+                'action': 'store_true',
+            },
+            {
+                'names': ['paths'],
+                'nargs': '*',
+            },
+        ],
+    }, argsfile_prefix=argsfile_prefix)
+
+
+def test_argsfile(tmpdir):
+    lines_path = tmpdir.join('lines')
+    lines_path.write_binary(b'--debug\r\npath 1\n\npath2')
+
+    nul_path = tmpdir.join('nul')
+    nul_path.write_binary(b'path 3\0\0path\n4\0')
+
+    empty_path = tmpdir.join('empty')
+    empty_path.write_binary(b'')
+
+    sys.argv = ['test']
+    parser = make_parser()
+
+    args = parser.parse(argv=shlex.split('@{} first @{} @{} last'.format(lines_path, nul_path, empty_path)))
+    assert args['debug'] is True
+    assert args['paths'] == ['path 1', 'path2', 'first', 'path 3', '', 'path\n4', 'last']
+
+    # Not expanded after '--', or without the option
+    args = parser.parse(argv=['--', '@{}'.format(lines_path)])
+    assert args['paths'] == ['@{}'.format(lines_path)]
+
+    args = make_parser(argsfile_prefix=None).parse(argv=['@{}'.format(lines_path)])
+    assert args['paths'] == ['@{}'.format(lines_path)]
+
+
+def test_argsfile_streaming(tmpdir, monkeypatch):
+    path = tmpdir.join('lines')
+    path.write_binary(b'\n'.join(b'path%d' % i for i in range(1000)))
+
+    # Small chunks, so tokens are split between them
+    monkeypatch.setattr('sargeparse.argsfile._chunk_size', 7)
+
+    with open(str(path), 'rb') as f:
+        tokens = list(sargeparse.argsfile._iter_stream(f, 'utf-8'))
+
+    assert tokens == list(iter_argsfile(str(path)))
+    assert tokens == ['path{}'.format(i) for i in range(1000)]
+
+
+def test_argsfile_missing(tmpdir, capsys):
+    sys.argv = ['test']
+
+    with pytest.raises(SystemExit):
+        make_parser().parse(argv=['@{}'.format(tmpdir.join('missing'))])
+
+    captured = capsys.readouterr()
+    assert "can't read arguments file" in captured.err
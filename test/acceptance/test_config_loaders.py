@@ -0,0 +1,123 @@
+# pylint: disable=redefined-outer-name
+import os
+import sys
+import json
+from unittest.mock import patch, Mock
+
+import pytest
+
+import sargeparse
+import sargeparse.config
+
+
+@pytest.fixture
+def parser():
+    sargeparse.config.clear_cache()
+    sys.argv = ['test']
+
+    return sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--config'],
+            },
+            {
+                'names': ['--host'],
+                'config_path': 'server/host',
+            },
+            {
+                'names': ['--port'],
+                'type': int,
+                'config_path': 'server/port',
+            },
+        ],
+    })
+
+
+def write(path, content, mtime=None):
+    with open(path, 'w') as f:
+        f.write(content)
+
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_config_loaders(parser, tmpdir):
+    json_path = str(tmpdir.join('config.json'))
+    ini_path = str(tmpdir.join('config.ini'))
+    toml_path = str(tmpdir.join('config.toml'))
+
+    write(json_path, json.dumps({'server': {'host': 'JSON', 'port': 1}}))
+    write(ini_path, '[server]\nhost = INI\nport = 2\n')
+    write(toml_path, '[server]\nhost = "TOML"\nport = 3\n')
+
+    for path, expected in [(json_path, ('JSON', 1)), (ini_path, ('INI', 2))]:
+        args = parser.parse(argv=[], read_config=sargeparse.ConfigLoader(path))
+        assert (args['host'], args['port']) == expected
+
+    if sargeparse.config._import_tomllib():
+        args = parser.parse(argv=[], read_config=sargeparse.toml_config(toml_path))
+        assert (args['host'], args['port']) == ('TOML', 3)
+
+    # Path from an argument
+    read_config = sargeparse.json_config(lambda data: data['config'])
+    args = parser.parse(argv=['--config', json_path], read_config=read_config)
+    assert args['host'] == 'JSON'
+
+    args = parser.parse(argv=[], read_config=read_config)
+    assert args['host'] == sargeparse.unset
+
+    # Missing files
+    args = parser.parse(argv=[], read_config=sargeparse.json_config(json_path + '.missing'))
+    assert args.configuration == {}
+
+    with pytest.raises(FileNotFoundError):
+        parser.parse(argv=[], read_config=sargeparse.json_config(json_path + '.missing', required=True))
+
+    with pytest.raises(ValueError):
+        sargeparse.ConfigLoader(str(tmpdir.join('config.yaml')))(None)
+
+
+def test_ini_config_without_interpolation(parser, tmpdir):
+    ini_path = str(tmpdir.join('percent.ini'))
+    write(ini_path, '[server]\nhost = 100%(host)s\n')
+
+    args = parser.parse(argv=[], read_config=sargeparse.ini_config(ini_path))
+    assert args['host'] == '100%(host)s'
+
+
+def test_config_loader_cache(parser, tmpdir):
+    path = str(tmpdir.join('config.json'))
+    write(path, json.dumps({'server': {'host': 'A'}}), mtime=1000000)
+
+    read_config = sargeparse.json_config(path)
+
+    m = Mock(wraps=sargeparse.config._load_json)
+    with patch.dict('sargeparse.config._loaders', json=m):
+        assert parser.parse(argv=[], read_config=read_config)['host'] == 'A'
+        assert parser.parse(argv=[], read_config=read_config)['host'] == 'A'
+        assert m.call_count == 1
+
+        # Cached configs can't be modified through the returned dict
+        read_config(None)['server']['host'] = 'MODIFIED'
+        assert parser.parse(argv=[], read_config=read_config)['host'] == 'A'
+        assert m.call_count == 1
+
+        write(path, json.dumps({'server': {'host': 'B'}}), mtime=2000000)
+        assert parser.parse(argv=[], read_config=read_config)['host'] == 'B'
+        assert m.call_count == 2
+
+
+def test_config_loader_disk_cache(parser, tmpdir):
+    path = str(tmpdir.join('config.json'))
+    cache_dir = str(tmpdir.join('cache'))
+    write(path, json.dumps({'server': {'host': 'A'}}))
+
+    assert parser.parse(argv=[], read_config=sargeparse.json_config(path, cache_dir=cache_dir))['host'] == 'A'
+    assert len(os.listdir(cache_dir)) == 1
+
+    sargeparse.config.clear_cache()
+
+    with patch.dict('sargeparse.config._loaders', json=Mock(side_effect=AssertionError)):
+        args = parser.parse(argv=[], read_config=sargeparse.json_config(path, cache_dir=cache_dir))
+
+    assert args['host'] == 'A'
@@ -0,0 +1,80 @@
+# pylint: disable=redefined-outer-name
+import os
+from unittest.mock import patch
+
+import sargeparse
+
+
+def cb_main(ctx):
+    return ctx.parser.prog
+
+
+def cb_sub(ctx):
+    return (ctx.return_value, ctx.parser.prog, ctx.data['arg1'], ctx.data['arg2'])
+
+
+def make_definition():
+    return {
+        'callback': cb_main,
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'default': sargeparse.unset,
+                'type': int,
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'sub',
+                'callback': cb_sub,
+                'arguments': [
+                    {
+                        'names': ['--arg2'],
+                        'default': 'A2',
+                    },
+                ],
+            },
+        ],
+    }
+
+
+def test_definition_cache(tmpdir):
+    cache_dir = str(tmpdir)
+
+    parser = sargeparse.Sarge(make_definition(), cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    parser.parse(argv=['--arg1', '1', 'sub'])
+    keys = sorted(parser._compiled.parser_data)
+    assert keys == ['_parser_', '_parser_sub']
+
+    # Callbacks lose their parser reference in a new process
+    del cb_main.parser
+    del cb_sub.parser
+
+    with patch('sargeparse._parser.parser.Parser.__init__', side_effect=AssertionError("Compiled again")):
+        cached_parser = sargeparse.Sarge(make_definition(), cache_dir=cache_dir)
+
+    args = cached_parser.parse(argv=['--arg1', '1', 'sub'])
+    assert sorted(cached_parser._compiled.parser_data) == keys
+    assert args.dispatch() == ('test', 'test sub', 1, 'A2')
+
+    # A different definition uses a different cache file
+    definition = make_definition()
+    definition['arguments'][0]['default'] = 0
+    sargeparse.Sarge(definition, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_definition_cache_not_cacheable(tmpdir, caplog):
+    cache_dir = str(tmpdir)
+
+    definition = make_definition()
+    definition['callback'] = lambda ctx: None
+
+    parser = sargeparse.Sarge(definition, cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == []
+    assert "Definition won't be cached" in caplog.text
+
+    args = parser.parse(argv=['sub'])
+    assert args['arg2'] == 'A2'
@@ -1,10 +1,12 @@
 # pylint: disable=redefined-outer-name
 import sys
 import shlex
+import asyncio
 import re
 
 from types import LambdaType
 from collections import ChainMap
+from unittest.mock import patch
 
 import pytest
 import sargeparse
@@ -366,3 +368,172 @@ def test_callback_subcommand_decorator_duplicate():
             pass
 
     assert "Cannot use the subcommand decorator with a 'callback' in the definition" in str(ex)
+
+
+def test_parser_data_rendered_on_access():
+    def cb_main(ctx):
+        assert ctx.parser.prog == 'test'
+        assert ctx.parser.help == ctx.parser.help
+        assert re.match(r'\s*usage:\s+test.*$', ctx.parser.usage)
+
+    parser = sargeparse.Sarge({
+        'callback': cb_main,
+        'subcommands': [
+            {
+                'name': 'sub',
+            }
+        ]
+    })
+
+    sys.argv = shlex.split('test')
+
+    with patch('sargeparse.custom.ArgumentParser.format_help', autospec=True, return_value='HELP') as format_help:
+        args = parser.parse()
+        assert format_help.call_count == 0
+
+        args.dispatch()
+        assert format_help.call_count == 1
+
+        args = parser.parse()
+        args.dispatch()
+        assert format_help.call_count == 1
+
+
+def test_callback_dispatch_async():
+    async def cb_main(ctx):
+        await asyncio.sleep(0)
+        ctx.obj.append('main')
+
+        if ctx.data['mode'] == 'die':
+            return sargeparse.die(100)
+
+        return 10
+
+    def cb_sub(ctx):
+        assert ctx.return_value == 10
+        ctx.obj.append('sub')
+
+        if ctx.data['mode'] == 'stop':
+            return sargeparse.stop(200)
+
+        return None
+
+    async def cb_subsub(ctx):
+        assert ctx.last is True
+        assert ctx.return_value is None
+        assert ctx.parser.prog == 'test sub subsub'
+        ctx.obj.append('subsub')
+
+        return 300
+
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--mode'],
+                'global': True,
+            },
+        ],
+        'callback': cb_main,
+        'subcommands': [
+            {
+                'name': 'sub',
+                'callback': cb_sub,
+                'subcommands': [
+                    {
+                        'name': 'subsub',
+                        'callback': cb_subsub,
+                    },
+                ],
+            },
+        ],
+    })
+
+    obj = []
+    args = parser.parse(['sub', 'subsub'])
+    assert asyncio.run(args.dispatch_async(obj=obj)) == 300
+    assert obj == ['main', 'sub', 'subsub']
+
+    obj = []
+    args = parser.parse(['sub', 'subsub', '--mode', 'stop'])
+    assert asyncio.run(args.dispatch_async(obj=obj)) == 200
+    assert obj == ['main', 'sub']
+
+    obj = []
+    args = parser.parse(['sub', 'subsub', '--mode', 'die'])
+    with pytest.raises(SystemExit) as ex:
+        asyncio.run(args.dispatch_async(obj=obj))
+    assert ex.value.code == 100
+    assert obj == ['main']
+
+    async def die_with_timeout():
+        with pytest.raises(SystemExit) as ex:
+            await args.dispatch_async(obj=[], timeout=10)
+        assert ex.value.code == 100
+
+        return 'event loop still running'
+
+    assert asyncio.run(die_with_timeout()) == 'event loop still running'
+
+
+def test_callback_dispatch_async_timeout_and_cancel():
+    cancelled = []
+
+    async def cb_main(ctx):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def cb_sub(ctx):  # pragma: no cover
+        raise AssertionError("Callbacks after a cancelled one must not be called")
+
+    parser = sargeparse.Sarge({
+        'callback': cb_main,
+        'subcommands': [
+            {
+                'name': 'sub',
+                'callback': cb_sub,
+            },
+        ],
+    })
+
+    args = parser.parse(['sub'])
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(args.dispatch_async(timeout=0.01))
+    assert cancelled == [True]
+
+    async def cancel():
+        task = asyncio.ensure_future(args.dispatch_async())
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    assert cancelled == [True, True]
+
+
+def test_parse_async():
+    def cb_main(ctx):
+        return ctx.data['arg']
+
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg'],
+            },
+        ],
+        'callback': cb_main,
+    })
+
+    async def main():
+        args = await parser.parse_async(['--arg', 'A'])
+        assert await args.dispatch_async() == 'A'
+
+        with sargeparse.custom.raise_on_exit():
+            with pytest.raises(sargeparse.custom.ArgumentParserError):
+                await parser.parse_async(['--unknown'])
+
+    asyncio.run(main())
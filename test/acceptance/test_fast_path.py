@@ -0,0 +1,143 @@
+# pylint: disable=redefined-outer-name
+import sys
+import shlex
+from unittest.mock import patch
+
+import pytest
+
+import sargeparse
+
+
+def make_parser(**kwargs):
+    return sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['-d', '--debug'],
+                'action': 'store_true',
+                'global': True,
+            },
+            {
+                'names': ['--level'],
+                'type': int,
+                'global': True,
+            },
+            {
+                'names': ['-v'],
+                'action': 'count',
+            },
+            {
+                'names': ['--name'],
+                'default': 'NAME',
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'run',
+                'aliases': ['r'],
+                'arguments': [
+                    {
+                        'names': ['--name'],
+                    },
+                    {
+                        'names': ['--de'],
+                        'action': 'store_true',
+                    },
+                ],
+                'subcommands': [
+                    {
+                        'name': 'fast',
+                        'arguments': [
+                            {
+                                'names': ['--speed'],
+                                'type': float,
+                            },
+                        ],
+                    },
+                ],
+            },
+            {
+                'name': 'positional',
+                'arguments': [
+                    {
+                        'names': ['file'],
+                    },
+                ],
+            },
+        ],
+    }, **kwargs)
+
+
+COMMAND_LINES = [
+    '',
+    '-d',
+    '--debug --level 3',
+    '--level=3 -v -v --name x',
+    '-v run --name y --debug',
+    'r --name y',
+    'run fast --speed 1.5 --level 4 -d',
+    'run --de',
+    'run --name=y=z fast',
+    'positional FILE -d',
+    '--name',
+    '--name -x',
+    '--level x',
+    '-vv',
+    '--lev 3',
+    'run --deb',
+    'run --name x -v',
+    'nope',
+    'run fast --speed -1',
+]
+
+
+@pytest.mark.parametrize('command_line', COMMAND_LINES)
+def test_fast_path_same_results(command_line):
+    sys.argv = ['test']
+    argv = shlex.split(command_line)
+
+    fast_parser = make_parser()
+    assert fast_parser.compile().fast_matcher
+
+    slow_parser = make_parser(fast_path=False)
+    assert slow_parser.compile().fast_matcher is None
+
+    fast_results = [r.__dict__ for r in fast_parser.parse_many([argv])]
+    slow_results = [r.__dict__ for r in slow_parser.parse_many([argv])]
+
+    for results in (fast_results, slow_results):
+        data = results[0].pop('data')
+        results[0]['data'] = data and (
+            dict(data),
+            [fn.parser.parser_key() for fn in data.callbacks],
+            sorted(data.parser_data),
+        )
+
+    assert fast_results == slow_results
+
+
+def test_fast_path_skips_argparse():
+    parser = make_parser(lazy_subcommands=True)
+    compiled = parser.compile()
+
+    with patch('sargeparse.custom.ArgumentParser.parse_known_args', side_effect=AssertionError):
+        args = compiled.parse(shlex.split('-d run fast --speed 2'))
+
+    assert args['debug'] is True
+    assert args['speed'] == 2.0
+
+    # Unsupported command lines fall back to argparse
+    args = compiled.parse(shlex.split('positional FILE'))
+    assert args['file'] == 'FILE'
+
+
+def test_fast_path_unsupported_definition():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg'],
+                'choices': ['a', 'b'],
+            },
+        ],
+    })
+
+    assert parser.compile().fast_matcher is None
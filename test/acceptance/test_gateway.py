@@ -0,0 +1,213 @@
+# pylint: disable=redefined-outer-name
+import os
+import sys
+import json
+import socket
+import asyncio
+import subprocess
+
+import pytest
+import sargeparse
+
+from sargeparse.gateway import CommandGateway
+
+
+@pytest.fixture
+def parser():
+    async def cb_main(ctx):
+        running = ctx.obj['running']
+        running.append(ctx.data['arg'])
+        ctx.obj['max_running'] = max(ctx.obj['max_running'], len(running))
+
+        try:
+            await asyncio.sleep(float(ctx.data['sleep']))
+        finally:
+            running.remove(ctx.data['arg'])
+
+        if ctx.data['arg'] == 'die':
+            return sargeparse.die(3)
+
+        if ctx.data['arg'] == 'raise':
+            raise RuntimeError('BOOM')
+
+        return ctx.data['arg']
+
+    sys.argv = ['test']
+
+    return sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg'],
+                'required': True,
+            },
+            {
+                'names': ['--sleep'],
+                'default': '0',
+            },
+        ],
+        'callback': cb_main,
+    })
+
+
+def make_gateway(parser, **kwargs):
+    return CommandGateway(parser, obj={'running': [], 'max_running': 0}, **kwargs)
+
+
+def test_gateway_handle_request(parser):
+    gateway = make_gateway(parser, timeout=0.05)
+
+    async def main():
+        response = await gateway.handle_request({'id': 1, 'argv': ['--arg', 'A']})
+        assert response == {'id': 1, 'status': 0, 'result': 'A'}
+
+        response = await gateway.handle_request(['--arg', 'B'])
+        assert response == {'id': None, 'status': 0, 'result': 'B'}
+
+        response = await gateway.handle_request({'id': 2, 'argv': ['--arg', 'die']})
+        assert response == {'id': 2, 'status': 3, 'error': {'type': 'die', 'message': None}}
+
+        response = await gateway.handle_request({'id': 3, 'argv': []})
+        assert response['status'] == 2
+        assert response['error']['type'] == 'usage'
+        assert response['error']['message'] == 'the following arguments are required: --arg'
+        assert response['error']['usage'].startswith('usage: test')
+
+        response = await gateway.handle_request({'id': 4, 'argv': ['--help']})
+        assert response['status'] == 0
+        assert response['error']['type'] == 'exit'
+        assert '--sleep SLEEP' in response['error']['output']
+
+        response = await gateway.handle_request({'id': 5, 'argv': ['--arg', 'raise']})
+        assert response['status'] == 1
+        assert response['error']['type'] == 'exception'
+        assert response['error']['exception'] == 'RuntimeError'
+        assert response['error']['message'] == 'BOOM'
+        assert 'traceback' not in response['error']
+
+        response = await gateway.handle_request({'id': 6, 'argv': ['--arg', 'T', '--sleep', '10']})
+        assert response['status'] == 1
+        assert response['error']['type'] == 'timeout'
+
+        response = await gateway.handle_request({'id': 7, 'argv': '--arg A'})
+        assert response['status'] == 2
+        assert response['error']['type'] == 'invalid_request'
+
+        assert gateway.obj['running'] == []
+
+    asyncio.run(main())
+
+
+def test_gateway_parse_exceptions(parser):
+    def read_config(data):
+        if data['arg'] == 'bad_config':
+            raise OSError('BAD CONFIG')
+
+        return {}
+
+    gateway = make_gateway(parser, read_config=read_config)
+
+    async def main():
+        response = await gateway.handle_request({'id': 1, 'argv': ['--arg', 'bad_config']})
+        assert response['status'] == 1
+        assert response['error']['type'] == 'exception'
+        assert response['error']['exception'] == 'OSError'
+        assert response['error']['message'] == 'BAD CONFIG'
+
+        response = await gateway.handle_request({'id': 2, 'argv': ['--arg', 'A']})
+        assert response == {'id': 2, 'status': 0, 'result': 'A'}
+
+    asyncio.run(main())
+
+
+def test_gateway_unsupported_definition():
+    parser = sargeparse.Sarge({
+        'subcommands': [
+            {
+                'name': 'sum',
+                'arguments': [
+                    {
+                        'names': ['numbers'],
+                        'nargs': '*',
+                        'stream': True,
+                    },
+                ],
+            },
+        ],
+    })
+
+    with pytest.raises(TypeError) as ex:
+        CommandGateway(parser)
+
+    assert 'stream' in str(ex.value)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="Unix only")
+def test_gateway_serve_unix(parser, tmpdir):
+    gateway = make_gateway(parser, max_concurrency=2)
+    path = str(tmpdir.join('gateway.sock'))
+
+    requests = [{'id': i, 'argv': ['--arg', str(i), '--sleep', '0.01']} for i in range(6)]
+
+    async def main():
+        server = await gateway.serve_unix(path)
+
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+
+            lines = [json.dumps(r) for r in requests] + ['', 'not json']
+            writer.write(''.join(line + '\n' for line in lines).encode('utf-8'))
+            writer.write_eof()
+
+            responses = []
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                responses.append(json.loads(line.decode('utf-8')))
+
+            writer.close()
+
+        return responses
+
+    responses = asyncio.run(main())
+
+    invalid = [r for r in responses if r['id'] is None]
+    assert len(invalid) == 1
+    assert invalid[0]['error']['type'] == 'invalid_request'
+
+    results = sorted((r for r in responses if r['id'] is not None), key=lambda r: r['id'])
+    assert results == [{'id': i, 'status': 0, 'result': str(i)} for i in range(6)]
+
+    assert gateway.obj['max_running'] == 2
+
+
+STDIO_SCRIPT = """
+import sys, asyncio, sargeparse
+from sargeparse.gateway import CommandGateway
+
+parser = sargeparse.Sarge({
+    'description': 'Gateway',
+    'arguments': [{'names': ['--arg'], 'help': None}],
+    'callback': lambda ctx: print('PRINTED') or ctx.data['arg'],
+})
+
+print('BEFORE', flush=True)
+asyncio.run(CommandGateway(parser).serve_stdio())
+print('AFTER')
+"""
+
+
+def test_gateway_serve_stdio():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    requests = json.dumps({'id': 1, 'argv': ['--arg', 'A']}) + '\n'
+
+    process = subprocess.run(
+        [sys.executable, '-c', STDIO_SCRIPT],
+        input=requests.encode('utf-8'), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+
+    # Prints in callbacks go to stderr, and stdout is restored when serve_stdio() returns
+    stdout = process.stdout.decode('utf-8').splitlines()
+    assert stdout == ['BEFORE', json.dumps({'id': 1, 'status': 0, 'result': 'A'}), 'AFTER']
+    assert process.stderr.decode('utf-8') == 'PRINTED\n'
@@ -1,9 +1,15 @@
 # pylint: disable=redefined-outer-name
 import os
 import sys
+import pickle
 import shlex
+import re
 
 from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
 
 import sargeparse
 
@@ -258,3 +264,631 @@ def test_custom_dest():
             'my_dest': sargeparse.unset,
         }
     )
+
+
+def test_compiled_parser_reused_until_definition_changes():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+            },
+        ],
+    })
+
+    subcommand = sargeparse.SubCommand({
+        'name': 'sub',
+    })
+    parser.add_subcommand(subcommand)
+
+    argv = ['--arg1', '1', 'sub']
+    args = parser.parse(argv=argv)
+    compiled = parser._compiled
+
+    assert args['arg1'] == '1'
+    assert argv == ['--arg1', '1', 'sub']
+
+    parser.parse(argv=['sub'])
+    assert parser._compiled is compiled
+
+    # Changes in the definition, at any depth, invalidate the compiled parser
+    subcommand.add_arguments({
+        'names': ['--arg2'],
+    })
+    args = parser.parse(argv=['sub', '--arg2', '2'])
+    assert parser._compiled is not compiled
+    assert args['arg2'] == '2'
+
+    compiled = parser._compiled
+    parser.add_defaults({'extra': 'EXTRA'})
+    args = parser.parse(argv=['sub'])
+    assert parser._compiled is not compiled
+    assert args['extra'] == 'EXTRA'
+
+
+def test_lazy_subcommands(capsys):
+    parser = sargeparse.Sarge({
+        'subcommands': [
+            {
+                'name': 'suba',
+                'help': 'SUBA_HELP',
+                'arguments': [
+                    {
+                        'names': ['--arg1'],
+                    },
+                ],
+                'subcommands': [
+                    {
+                        'name': 'subsuba',
+                        'help': 'SUBSUBA_HELP',
+                    },
+                ],
+            },
+            {
+                'name': 'subb',
+                'help': 'SUBB_HELP',
+            },
+        ],
+    }, lazy_subcommands=True)
+
+    sys.argv = ['test']
+
+    suba, subb = parser._parser.subparsers
+    subsuba = suba.subparsers.get('subsuba')
+
+    args = parser.parse(argv=['suba', '--arg1', '1'])
+    assert args['arg1'] == '1'
+    assert suba.parser_key() in args.parser_data
+    assert subsuba.parser_key() not in args.parser_data
+    assert subb.parser_key() not in args.parser_data
+
+    args = parser.parse(argv=['subb'])
+    assert subb.parser_key() in args.parser_data
+
+    # Stubs are still listed in the help
+    with pytest.raises(SystemExit):
+        parser.parse(argv=['-h'])
+
+    captured = capsys.readouterr()
+    assert re.search(r'suba\s+SUBA_HELP', captured.out)
+    assert re.search(r'subb\s+SUBB_HELP', captured.out)
+    assert 'SUBSUBA_HELP' not in captured.out
+
+    with pytest.raises(SystemExit):
+        parser.parse(argv=['help', 'suba'])
+
+    captured = capsys.readouterr()
+    assert re.search(r'subsuba\s+SUBSUBA_HELP', captured.out)
+
+
+def test_envvar_prefix():
+    parser = sargeparse.Sarge({
+        'envvar_prefix': 'MYTOOL_',
+        'arguments': [
+            {
+                'names': ['--level'],
+                'type': int,
+                'global': True,
+            },
+            {
+                'names': ['--name'],
+                'envvar': 'MYTOOL_OTHER_NAME',
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'run',
+                'arguments': [
+                    {
+                        'names': ['--run-speed'],
+                        'type': float,
+                    },
+                ],
+            },
+            {
+                'name': 'own',
+                'envvar_prefix': 'OWN_',
+                'arguments': [
+                    {
+                        'names': ['--run-speed'],
+                        'type': float,
+                    },
+                ],
+            },
+        ],
+    })
+
+    sys.argv = ['test']
+    os.environ['MYTOOL_LEVEL'] = '3'
+    os.environ['MYTOOL_NAME'] = 'IGNORED'
+    os.environ['MYTOOL_OTHER_NAME'] = 'NAME'
+    os.environ['MYTOOL_RUN_SPEED'] = '1.5'
+    os.environ['OWN_RUN_SPEED'] = '2.5'
+
+    try:
+        args = parser.parse(argv=['run'])
+        assert args.environment == {'level': 3, 'name': 'NAME', 'run_speed': 1.5}
+
+        args = parser.parse(argv=['own'])
+        assert args.environment == {'level': 3, 'name': 'NAME', 'run_speed': 2.5}
+
+        # Command line still takes precedence
+        args = parser.parse(argv=['--level', '4', 'run'])
+        assert args['level'] == 4
+
+    finally:
+        for envvar in ['MYTOOL_LEVEL', 'MYTOOL_NAME', 'MYTOOL_OTHER_NAME', 'MYTOOL_RUN_SPEED', 'OWN_RUN_SPEED']:
+            del os.environ[envvar]
+
+    with pytest.raises(TypeError) as ex:
+        sargeparse.Sarge({'envvar_prefix': 1})
+
+    assert 'envvar_prefix' in str(ex.value)
+
+
+def test_skip_shadowed_sources():
+    converted = []
+
+    def to_int(value):
+        converted.append(value)
+        return int(value)
+
+    def make_parser(**kwargs):
+        return sargeparse.Sarge({
+            'arguments': [
+                {
+                    'names': ['--arg1'],
+                    'type': to_int,
+                    'default': '1',
+                    'envvar': 'SHADOWED_ARG1',
+                    'config_path': 'arg1',
+                },
+                {
+                    'names': ['--arg2'],
+                    'type': to_int,
+                    'default': '2',
+                    'envvar': 'SHADOWED_ARG2',
+                    'config_path': 'arg2',
+                },
+                {
+                    'names': ['--arg3'],
+                    'type': to_int,
+                    'default': '3',
+                    'config_path': 'arg3',
+                },
+            ],
+        }, **kwargs)
+
+    def read_config(_data):
+        return {'arg1': '10', 'arg2': '20', 'arg3': '30'}
+
+    sys.argv = ['test']
+    os.environ['SHADOWED_ARG1'] = '100'
+    os.environ['SHADOWED_ARG2'] = '200'
+    argv = ['--arg1', '1000']
+
+    try:
+        # argparse always applies the type to command line values
+        for precedence, expected_conversions in [
+                (None, ['1000', '200', '30']),
+                (['defaults', 'configuration', 'environment', 'cli'], ['1000', '1', '2', '3']),
+        ]:
+            args = make_parser(precedence=precedence).parse(argv=argv, read_config=read_config)
+            expected = dict(args)
+
+            del converted[:]
+            args = make_parser(precedence=precedence, skip_shadowed=True).parse(argv=argv, read_config=read_config)
+            assert dict(args) == expected
+            assert converted == expected_conversions
+
+        assert expected == {'arg1': 1, 'arg2': 2, 'arg3': 3}
+        assert args.environment == {}
+        assert args.configuration == {}
+
+    finally:
+        del os.environ['SHADOWED_ARG1']
+        del os.environ['SHADOWED_ARG2']
+
+
+def test_config_paths():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--host'],
+                'config_path': 'server/host',
+            },
+            {
+                'names': ['--port'],
+                'type': int,
+                'config_path': ['server', 'port'],
+            },
+            {
+                'names': ['--tags'],
+                'nargs': '*',
+                'config_path': 'tags',
+            },
+            {
+                'names': ['--missing'],
+                'config_path': 'server/missing/key',
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'run',
+                'arguments': [
+                    {
+                        'names': ['--speed'],
+                        'type': float,
+                        'config_path': 'run/speed',
+                    },
+                ],
+            },
+        ],
+    })
+
+    def read_config(_data):
+        return {
+            'server': {
+                'host': 'HOST',
+                'port': '80',
+                'user': 'USER',
+            },
+            'tags': ['a', 'b'],
+            'run': {
+                'speed': '1.5',
+            },
+            'other': {
+                'key': 'VALUE',
+            },
+        }
+
+    sys.argv = ['test']
+
+    args = parser.parse(argv=['run'], read_config=read_config)
+    assert args.configuration == {'host': 'HOST', 'port': 80, 'tags': ['a', 'b'], 'speed': 1.5}
+    assert sorted(args.unused_config_keys()) == ['other', 'server/user']
+
+    args = parser.parse(argv=[], read_config=read_config)
+    assert sorted(args.unused_config_keys()) == ['other', 'run', 'server/user']
+
+    args = parser.parse(argv=[])
+    assert args.unused_config_keys() == []
+
+
+def test_type_cache():
+    converted = []
+
+    def to_int(value):
+        converted.append(value)
+        return int(value)
+
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'type': to_int,
+                'type_cache': 2,
+                'default': '1',
+            },
+            {
+                'names': ['--arg2'],
+                'type': to_int,
+                'type_cache': 2,
+                'nargs': '*',
+                'config_path': 'arg2',
+            },
+            {
+                'names': ['--arg3'],
+                'type': to_int,
+                'default': '3',
+            },
+            {
+                'names': ['--arg4'],
+                'type': int,
+                'type_cache': 10,
+                'default': '4',
+            },
+        ],
+    })
+
+    sys.argv = ['test']
+
+    for _ in range(3):
+        args = parser.parse(argv=[])
+        assert (args['arg1'], args['arg3']) == (1, 3)
+
+    # Default of arg1 is converted once, arg3 has no cache
+    assert converted == ['1', '3', '3', '3']
+
+    del converted[:]
+    for values in (['5', '6'], ['6', '5'], ['7', '5'], ['5'], ['6']):
+        args = parser.parse(argv=[], read_config=lambda data, values=values: {'arg2': values})
+        assert args['arg2'] == [int(v) for v in values]
+
+    # Least recently used values are evicted
+    assert converted == ['3', '5', '6', '3', '3', '7', '3', '3', '6']
+
+    with pytest.raises(TypeError) as ex:
+        sargeparse.Sarge({'arguments': [{'names': ['--arg'], 'type_cache': True}]})
+
+    assert 'type_cache' in str(ex.value)
+
+    # Caches aren't pickled
+    argument = parser._parser.arguments[3]
+    assert argument.get_default_value(apply_type=True) == 4
+    argument = pickle.loads(pickle.dumps(argument))
+    assert argument.get_default_value(apply_type=True) == 4
+
+
+def test_subcommand_registry(capsys):
+    parser = sargeparse.Sarge({
+        'subcommands': [
+            {
+                'name': 'remove',
+                'aliases': ['rm'],
+                'help': 'REMOVE_HELP',
+            },
+            {
+                'name': 'rename',
+                'help': 'RENAME_HELP',
+            },
+            {
+                'name': 'list',
+                'help': 'LIST_HELP',
+            },
+        ],
+    })
+
+    remove, rename, list_ = parser._parser.subparsers
+    registry = parser._parser.subparsers
+
+    assert len(registry) == 3
+    assert list(registry.names()) == ['remove', 'rm', 'rename', 'list']
+    assert registry.get('remove') is remove
+    assert registry.get('rm') is remove
+    assert registry.get('re') is None
+    assert registry.get('list') is list_
+    assert registry.get('rename') is rename
+
+    with pytest.raises(ValueError) as ex:
+        parser.add_subcommands(sargeparse.SubCommand({
+            'name': 'rm',
+            'help': None,
+        }))
+
+    assert "'rm'" in str(ex.value)
+
+    assert registry.get_by_prefix('rem') is remove
+    assert registry.get_by_prefix('rm') is remove
+    assert registry.get_by_prefix('l') is list_
+    assert registry.get_by_prefix('re') is None
+    assert registry.get_by_prefix('x') is None
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_abbrev_subcommands(capsys, lazy):
+    definition = {
+        'subcommands': [
+            {
+                'name': 'remove',
+                'aliases': ['rm'],
+                'help': 'REMOVE_HELP',
+                'subcommands': [
+                    {
+                        'name': 'all',
+                        'help': 'ALL_HELP',
+                    },
+                ],
+            },
+            {
+                'name': 'rename',
+                'help': 'RENAME_HELP',
+                'arguments': [
+                    {
+                        'names': ['--to'],
+                        'help': None,
+                    },
+                ],
+            },
+            {
+                'name': 'hello',
+                'help': 'HELLO_HELP',
+            },
+        ],
+    }
+
+    sys.argv = ['test']
+
+    def selected(args):
+        return [subparser.name for subparser in args._state.active_parsers[1:]]
+
+    parser = sargeparse.Sarge(definition, lazy_subcommands=lazy, abbrev_subcommands=True)
+
+    args = parser.parse(argv=['ren', '--to', 'x'])
+    assert args['to'] == 'x'
+    assert selected(args) == ['rename']
+
+    args = parser.parse(argv=['remo', 'a'])
+    assert selected(args) == ['remove', 'all']
+
+    args = parser.parse(argv=['rm'])
+    assert selected(args) == ['remove']
+
+    # Ambiguous prefixes, including the ones of the help subcommand
+    for argv in (['re'], ['he']):
+        with pytest.raises(SystemExit):
+            parser.parse(argv=argv)
+
+        captured = capsys.readouterr()
+        assert "invalid choice: '{}'".format(argv[0]) in captured.err
+
+    args = parser.parse(argv=['hell'])
+    assert selected(args) == ['hello']
+
+    # It's opt-in
+    parser = sargeparse.Sarge(definition, lazy_subcommands=lazy)
+
+    with pytest.raises(SystemExit):
+        parser.parse(argv=['ren'])
+
+    capsys.readouterr()
+
+
+def test_lazy_subcommands_wide_tree(capsys):
+    parser = sargeparse.Sarge({
+        'subcommands': [
+            {
+                'name': 'sub{}'.format(i),
+                'aliases': ['s{}'.format(i)],
+                'help': 'SUB{}_HELP'.format(i),
+                'arguments': [
+                    {
+                        'names': ['--arg'],
+                        'help': None,
+                    },
+                ],
+            }
+            for i in range(500)
+        ],
+    }, lazy_subcommands=True, fast_path=False)
+
+    sys.argv = ['test']
+
+    args = parser.parse(argv=['s250', '--arg', '1'])
+    assert args['arg'] == '1'
+    assert [key for key in args.parser_data if key != '_parser_'] == ['_parser_sub250']
+
+    with pytest.raises(SystemExit):
+        parser.parse(argv=['nope'])
+
+    captured = capsys.readouterr()
+    assert "invalid choice: 'nope'" in captured.err
+
+    with pytest.raises(SystemExit):
+        parser.parse(argv=['-h'])
+
+    captured = capsys.readouterr()
+    assert re.search(r'sub499 \(s499\)\s+SUB499_HELP', captured.out)
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'lazy_subcommands': True}, {'fast_path': False}])
+def test_only_active_path_is_walked(kwargs):
+    parser = sargeparse.Sarge({
+        'defaults': {'main': 'MAIN'},
+        'subcommands': [
+            {
+                'name': 'sub{}'.format(i),
+                'aliases': ['s{}'.format(i)],
+                'defaults': {'sub': i},
+                'subcommands': [
+                    {
+                        'name': 'subsub',
+                        'arguments': [
+                            {
+                                'names': ['--arg'],
+                                'default': 'DEFAULT',
+                            },
+                        ],
+                    },
+                ],
+            }
+            for i in range(100)
+        ],
+    }, **kwargs)
+
+    sys.argv = ['test']
+    compiled = parser.compile()
+
+    # Lazy subcommands are built the first time
+    compiled.parse(['s42', 'subsub'])
+
+    with patch('sargeparse._parser.registry.SubcommandRegistry.__iter__', side_effect=AssertionError):
+        args = compiled.parse(['s42', 'subsub'])
+
+    assert (args['main'], args['sub'], args['arg']) == ('MAIN', 42, 'DEFAULT')
+    assert [fn.parser.parser_key() for fn in args.callbacks] == ['_parser_', '_parser_sub42', '_parser_sub42 subsub']
+    assert not [k for k in args.cli if k.startswith('_parser_')]
+
+
+def test_precedence_kwarg():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'default': 'DEFAULT',
+                'envvar': 'ARG1',
+            },
+        ],
+    }, precedence=['defaults', 'cli', 'environment', 'configuration'])
+
+    os.environ['ARG1'] = 'ENV'
+    args = parser.parse(argv=['--arg1', 'CLI'])
+    os.environ.pop('ARG1')
+
+    assert args['arg1'] == 'DEFAULT'
+
+
+def test_compiled_parse_returns_new_data():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'type': int,
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'sub',
+                'arguments': [
+                    {
+                        'names': ['--arg2'],
+                        'default': 'A2',
+                    },
+                ],
+            },
+        ],
+    })
+
+    compiled = parser.compile()
+    assert isinstance(compiled, sargeparse.CompiledSarge)
+    assert parser.compile() is compiled
+
+    args1 = compiled.parse(argv=['--arg1', '1'])
+    args2 = parser.parse(argv=['--arg1', '2', 'sub'])
+
+    assert args1 is not args2
+    assert args1['arg1'] == 1
+    assert 'arg2' not in args1
+    assert args2['arg1'] == 2
+    assert args2['arg2'] == 'A2'
+
+
+def test_compiled_parse_threads():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'type': int,
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'sub{}'.format(i),
+                'arguments': [
+                    {
+                        'names': ['--arg2'],
+                        'type': int,
+                    },
+                ],
+            } for i in range(10)
+        ],
+    }, lazy_subcommands=True)
+
+    compiled = parser.compile()
+
+    def parse(i):
+        args = compiled.parse(argv=['--arg1', str(i), 'sub{}'.format(i % 10), '--arg2', str(i * 2)])
+        return i, args['arg1'], args['arg2']
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for i, arg1, arg2 in executor.map(parse, range(200)):
+            assert (arg1, arg2) == (i, i * 2)
@@ -31,9 +31,8 @@ def test_mutex_group_required(capsys):
     assert re.search(r'\[\s*?-x\s+?.+?\|\s*?-y\s+?.+?\]', captured.out)
 
     definition['arguments'][0]['required'] = True
-    parser = sargeparse.Sarge(definition)
     with pytest.raises(ValueError) as ex:
-        parser.parse()
+        sargeparse.Sarge(definition)
 
     assert 'must have the same value' in str(ex)
 
@@ -68,9 +67,8 @@ def test_mutex_group_global(capsys):
     assert re.search(r'\[\s*?-x\s+?.+?\|\s*?-y\s+?.+?\]', captured.out)
 
     definition['arguments'][0]['global'] = True
-    parser = sargeparse.Sarge(definition)
     with pytest.raises(ValueError) as ex:
-        parser.parse()
+        sargeparse.Sarge(definition)
 
     assert 'must have the same value' in str(ex)
 
@@ -100,12 +98,10 @@ def test_mutex_group_global_required():
         ],
     }
 
-    parser = sargeparse.Sarge(definition)
     sys.argv = shlex.split('test -h')
 
-    parser = sargeparse.Sarge(definition)
     with pytest.raises(ValueError) as ex:
-        parser.parse()
+        sargeparse.Sarge(definition)
 
     assert 'must have the same value' in str(ex)
 
@@ -133,9 +129,8 @@ def test_mutex_group_groups(capsys):
     assert re.search(r'\[\s*?-x\s+?.+?\|\s*?-y\s+?.+?\]', captured.out)
 
     definition['arguments'][0]['group'] = 'G'
-    parser = sargeparse.Sarge(definition)
     with pytest.raises(ValueError) as ex:
-        parser.parse()
+        sargeparse.Sarge(definition)
 
     assert 'must have the same value' in str(ex)
 
@@ -165,11 +160,74 @@ def test_mutex_group_groups_required():
         ],
     }
 
-    parser = sargeparse.Sarge(definition)
     sys.argv = shlex.split('test -h')
 
-    parser = sargeparse.Sarge(definition)
     with pytest.raises(ValueError) as ex:
-        parser.parse()
+        sargeparse.Sarge(definition)
 
     assert 'must have the same value' in str(ex)
+
+
+def test_argument_index():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--debug'],
+                'global': True,
+            },
+            {
+                'names': ['-x'],
+                'mutex_group': 1,
+                'group': 'X or Y',
+            },
+            {
+                'names': ['-y'],
+                'mutex_group': 1,
+                'group': 'X or Y',
+            },
+            {
+                'names': ['file'],
+            },
+        ],
+    })
+
+    index = parser.argument_index
+    debug, x, y, file = index.arguments
+
+    assert index.global_arguments == [debug]
+    assert index.local_arguments == [x, y, file]
+    assert index.positional_arguments == [file]
+    assert index.optional_arguments == [debug, x, y]
+    assert index.groups == {
+        'general arguments': [debug],
+        'X or Y': [x, y],
+        'optional arguments': [file],
+    }
+    assert list(index.mutex_groups) == [1]
+    assert index.mutex_groups[1].arguments == [x, y]
+    assert index.mutex_groups[1].required is False
+
+    assert index.select() == [debug, x, y, file]
+    assert index.select({'global': True}) == [debug]
+    assert index.select({'global': False, 'group': 'X or Y'}) == [x, y]
+
+
+def test_mutex_group_validated_when_adding_arguments():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['-x'],
+                'mutex_group': 1,
+            },
+        ],
+    })
+
+    with pytest.raises(ValueError) as ex:
+        parser.add_arguments({
+            'names': ['-y'],
+            'mutex_group': 1,
+            'global': True,
+        })
+
+    assert "'global' property must have the same value" in str(ex)
+    assert [a.dest for a in parser.argument_index.arguments] == ['x']
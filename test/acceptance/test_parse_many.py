@@ -0,0 +1,62 @@
+# pylint: disable=redefined-outer-name
+import sys
+import shlex
+
+import sargeparse
+
+
+def test_parse_many(capsys):
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'type': int,
+                'required': True,
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'sub',
+                'help': 'SUB_HELP',
+            },
+        ],
+    })
+
+    sys.argv = ['test']
+
+    lines = [
+        '--arg1 1',
+        '--arg1 x',
+        '--arg1 2 sub',
+        'sub',
+        '--arg1 3 sub --help',
+        '--arg1 4 nope',
+    ]
+
+    results = parser.parse_many(shlex.split(line) for line in lines)
+    assert not isinstance(results, list)
+
+    results = list(results)
+    assert [r.index for r in results] == list(range(len(lines)))
+    assert [r.ok for r in results] == [True, False, True, False, False, False]
+
+    assert results[0].data['arg1'] == 1
+    assert results[2].data['arg1'] == 2
+    assert results[2].data is not results[0].data
+
+    assert results[1].status == 2
+    assert "invalid int value: 'x'" in results[1].error
+    assert results[1].usage.startswith('usage: test')
+    assert results[1].data is None
+
+    assert 'required: --arg1' in results[3].error
+    assert "invalid choice: 'nope'" in results[5].error
+
+    assert results[4].status == 0
+    assert results[4].error is None
+    assert results[4].output.startswith('usage: test sub')
+
+    # Nothing was printed
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err == ''
@@ -1,4 +1,5 @@
 # pylint: disable=redefined-outer-name
+import os
 import sys
 import re
 from collections import ChainMap
@@ -74,3 +75,121 @@ def test_read_config_returns_none():
             'arg': sargeparse.unset,
         },
     )
+
+
+def test_refresh():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'envvar': 'REFRESH_ARG1',
+                'config_path': 'arg1',
+                'default': 'DEFAULT1',
+            },
+            {
+                'names': ['--arg2'],
+                'type': int,
+                'config_path': 'arg2',
+            },
+            {
+                'names': ['--arg3'],
+                'default': 'DEFAULT3',
+            },
+        ],
+    })
+
+    config = {'arg1': 'CONFIG1', 'arg2': '2'}
+    read_config_calls = []
+
+    def read_config(data):
+        read_config_calls.append(data)
+        return dict(config)
+
+    sys.argv = ['test']
+    args = parser.parse(argv=['--arg3', 'CLI3'], read_config=read_config)
+    assert (args['arg1'], args['arg2'], args['arg3']) == ('CONFIG1', 2, 'CLI3')
+
+    notifications = []
+    args.subscribe(notifications.append)
+
+    config['arg2'] = '3'
+    del config['arg1']
+    os.environ['REFRESH_ARG1'] = 'ENV1'
+
+    try:
+        # Environment isn't read again unless it's requested
+        assert args.refresh(sources=['configuration']) == {'arg1', 'arg2'}
+        assert (args['arg1'], args['arg2'], args['arg3']) == ('DEFAULT1', 3, 'CLI3')
+        assert read_config_calls == [args, args]
+
+        assert args.refresh() == {'arg1'}
+        assert args['arg1'] == 'ENV1'
+        assert args.environment == {'arg1': 'ENV1'}
+
+    finally:
+        del os.environ['REFRESH_ARG1']
+
+    # Nothing changed, subscribers aren't notified
+    assert args.refresh(sources=['configuration']) == set()
+
+    assert notifications == [{'arg1', 'arg2'}, {'arg1'}]
+
+    with pytest.raises(ValueError):
+        args.refresh(sources=['cli'])
+
+
+def test_refresh_skip_shadowed():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'config_path': 'arg1',
+                'default': 'DEFAULT1',
+            },
+        ],
+    }, skip_shadowed=True)
+
+    config = {'arg1': 'CONFIG1'}
+
+    sys.argv = ['test']
+    args = parser.parse(argv=[], read_config=lambda data: dict(config))
+    assert args['arg1'] == 'CONFIG1'
+    assert args.defaults == {}
+
+    # Defaults that were skipped are read when they're no longer shadowed
+    del config['arg1']
+    assert args.refresh(sources=['configuration']) == {'arg1'}
+    assert args['arg1'] == 'DEFAULT1'
+
+
+@pytest.mark.parametrize('skip_shadowed', [False, True])
+def test_refresh_keeps_command_defaults(skip_shadowed):
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg1'],
+                'config_path': 'arg1',
+                'default': 'DEFAULT1',
+            },
+        ],
+        'defaults': {'extra': 'EXTRA'},
+        'subcommands': [
+            {
+                'name': 'run',
+                'defaults': {'sub_extra': 'SUB_EXTRA'},
+            },
+        ],
+    }, skip_shadowed=skip_shadowed)
+    parser.add_defaults({'added': 'ADDED'})
+
+    sys.argv = ['test']
+    args = parser.parse(argv=['run'], read_config=lambda data: {'arg1': 'CONFIG1'})
+
+    expected = {'arg1': 'CONFIG1', 'extra': 'EXTRA', 'sub_extra': 'SUB_EXTRA', 'added': 'ADDED'}
+    assert dict(args) == expected
+
+    args.refresh()
+    assert dict(args) == expected
+
+    args.refresh(sources=['defaults'])
+    assert dict(args) == expected
@@ -0,0 +1,128 @@
+# pylint: disable=redefined-outer-name
+import os
+import sys
+import signal
+import socket
+import threading
+import subprocess
+
+import pytest
+import sargeparse
+
+from sargeparse.server import CommandServer
+from sargeparse_client import run_client
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'), reason="Unix only")
+
+
+@pytest.fixture
+def server(tmpdir):
+    def cb_main(ctx):
+        print('cwd={} arg={} env={}'.format(os.getcwd(), ctx.data['arg'], ctx.data['env']))
+
+        if ctx.data['arg'] == 'die':
+            return sargeparse.die(3)
+
+        if ctx.data['arg'] == 'raise':
+            raise RuntimeError('BOOM')
+
+        if ctx.data['arg'] == 'kill':
+            os.kill(os.getpid(), signal.SIGKILL)
+
+        return None
+
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--arg'],
+            },
+            {
+                'names': ['--env'],
+                'envvar': 'TEST_SERVER_ENV',
+            },
+        ],
+        'callback': cb_main,
+    })
+
+    sys.argv = ['test']
+
+    path = str(tmpdir.join('server.sock'))
+    with CommandServer(parser, path, poll_interval=0.05, request_timeout=1) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            thread.join()
+
+    assert not os.path.exists(path)
+
+
+def run(server, tmpdir, argv, **kwargs):
+    paths = [str(tmpdir.join(name)) for name in ('stdin', 'stdout', 'stderr')]
+    open(paths[0], 'w').close()
+
+    fds = [os.open(paths[0], os.O_RDONLY)] + [os.open(p, os.O_WRONLY | os.O_CREAT | os.O_TRUNC) for p in paths[1:]]
+    try:
+        status = run_client(server.path, argv, fds=fds, **kwargs)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+    with open(paths[1]) as stdout, open(paths[2]) as stderr:
+        return status, stdout.read(), stderr.read()
+
+
+def test_command_server(server, tmpdir, monkeypatch):
+    monkeypatch.delenv('TEST_SERVER_ENV', raising=False)
+    server_cwd = os.getcwd()
+    cwd = str(tmpdir.mkdir('worker'))
+    assert cwd != server_cwd
+
+    status, stdout, stderr = run(server, tmpdir, ['--arg', 'A'], env={'TEST_SERVER_ENV': 'E'}, cwd=cwd)
+    assert (status, stdout, stderr) == (0, 'cwd={} arg=A env=E\n'.format(cwd), '')
+
+    status, stdout, _ = run(server, tmpdir, ['--arg', 'die'], env={}, cwd=cwd)
+    assert status == 3
+    assert 'env=<sargeparse.unset>' in stdout
+
+    status, _, stderr = run(server, tmpdir, ['--nope'], env={}, cwd=cwd)
+    assert status == 2
+    assert 'error: unrecognized arguments: --nope' in stderr
+
+    status, _, stderr = run(server, tmpdir, ['--arg', 'raise'], env={}, cwd=cwd)
+    assert status == 1
+    assert 'RuntimeError: BOOM' in stderr
+
+    status, _, _ = run(server, tmpdir, ['--arg', 'kill'], env={}, cwd=cwd)
+    assert status == 128 + signal.SIGKILL
+
+    # The server process isn't affected by the workers
+    assert os.getcwd() == server_cwd
+    assert 'TEST_SERVER_ENV' not in os.environ
+
+
+def test_command_server_shim(server, tmpdir):
+    cwd = str(tmpdir)
+    env = {k: v for k, v in os.environ.items() if k != 'TEST_SERVER_ENV'}
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+
+    process = subprocess.run(
+        [sys.executable, '-m', 'sargeparse_client', server.path, '--arg', 'S'],
+        cwd=cwd, env=env, stdout=subprocess.PIPE, check=False,
+    )
+    assert process.returncode == 0
+    assert process.stdout.decode() == 'cwd={} arg=S env=<sargeparse.unset>\n'.format(cwd)
+
+    # The client doesn't import sargeparse
+    code = 'import sys, sargeparse_client; assert "sargeparse" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, check=True)
+
+
+def test_command_server_address_in_use(server):
+    with pytest.raises(OSError) as ex:
+        CommandServer(sargeparse.Sarge({}), server.path).bind()
+
+    assert 'already listening' in str(ex.value)
@@ -0,0 +1,177 @@
+import sys
+import shlex
+from unittest.mock import patch
+
+import pytest
+
+import sargeparse
+
+
+def make_parser(**kwargs):
+    return sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['-d', '--debug'],
+                'action': 'store_true',
+                'global': True,
+            },
+            {
+                'names': ['--level'],
+                'type': int,
+                'default': 0,
+                'global': True,
+            },
+            {
+                'names': ['--name'],
+                'default': 'NAME',
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'run',
+                'arguments': [
+                    {
+                        'names': ['--name'],
+                    },
+                ],
+                'subcommands': [
+                    {
+                        'name': 'fast',
+                        'arguments': [
+                            {
+                                'names': ['--speed'],
+                                'type': float,
+                            },
+                        ],
+                    },
+                ],
+            },
+            {
+                'name': 'positional',
+                'arguments': [
+                    {
+                        'names': ['file'],
+                    },
+                ],
+            },
+        ],
+    }, fast_path=False, **kwargs)
+
+
+COMMAND_LINES = [
+    '',
+    '-d',
+    '--debug --level 3',
+    'run --level 1 fast --level 2',
+    '--level 1 run fast',
+    'run fast --speed 1.5 --level 4 -d',
+    'run --deb --name x',
+    'positional FILE -d',
+    'positional -d FILE --level=5',
+    '--level x',
+    'run fast --level',
+    '-d help --level 2',
+    '--level 1 help run -d',
+    'nope',
+]
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('command_line', COMMAND_LINES)
+def test_single_pass_same_results(command_line, lazy):
+    sys.argv = ['test']
+    argv = shlex.split(command_line)
+
+    single_pass_parser = make_parser(single_pass=True, lazy_subcommands=lazy)
+    assert single_pass_parser.compile().single_pass
+
+    two_pass_parser = make_parser(lazy_subcommands=lazy)
+    assert not two_pass_parser.compile().single_pass
+
+    single_pass_result, = single_pass_parser.parse_many([argv])
+    two_pass_result, = two_pass_parser.parse_many([argv])
+
+    assert single_pass_result.status == two_pass_result.status
+    if two_pass_result.ok:
+        assert values(single_pass_result.data) == values(two_pass_result.data)
+
+
+def values(data):
+    # The help subcommand leaves its parser key (with a callback that's different in every parser) in the data
+    return {k: v for k, v in data.items() if not k.startswith('_parser_')}
+
+
+def test_single_pass_parses_once(capsys):
+    sys.argv = ['test']
+    parser = make_parser(single_pass=True)
+
+    compiled = parser.compile()
+
+    # Global arguments aren't parsed first
+    with patch.object(compiled.global_parser.parser, 'parse_known_args', side_effect=AssertionError):
+        args = compiled.parse(shlex.split('run -d fast --level 2'))
+
+    assert args['debug'] is True
+    assert args['level'] == 2
+
+    # Global arguments are hidden in subcommands help
+    with pytest.raises(SystemExit):
+        parser.parse(shlex.split('run -h'))
+
+    captured = capsys.readouterr()
+    assert '--level' not in captured.out
+
+
+def test_single_pass_unsupported_definition():
+    parser = sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['-v'],
+                'action': 'count',
+                'global': True,
+            },
+        ],
+        'subcommands': [
+            {
+                'name': 'run',
+            },
+        ],
+    }, single_pass=True, fast_path=False)
+
+    sys.argv = ['test']
+
+    assert not parser.compile().single_pass
+    assert parser.parse(shlex.split('-v run -v'))['v'] == 2
+
+
+def test_single_pass_with_fast_path():
+    sys.argv = ['test']
+
+    def make(**kwargs):
+        return sargeparse.Sarge({
+            'arguments': [
+                {
+                    'names': ['--level'],
+                    'global': True,
+                },
+            ],
+            'subcommands': [
+                {
+                    'name': 'sub',
+                    'arguments': [
+                        {
+                            'names': ['--level'],
+                            'dest': 'sublevel',
+                        },
+                    ],
+                },
+            ],
+        }, single_pass=True, **kwargs)
+
+    for parser in (make(fast_path=True), make(fast_path=False)):
+        assert parser.compile().single_pass
+        assert parser.compile().fast_matcher is None
+
+        args = parser.parse(['sub', '--level', '1'])
+        assert args['sublevel'] == '1'
+        assert args['level'] == sargeparse.unset
@@ -0,0 +1,108 @@
+import io
+import os
+import sys
+
+import pytest
+
+import sargeparse
+
+
+def make_parser(stream=True, **kwargs):
+    numbers = {
+        'names': ['numbers'],
+        'nargs': '*',
+        'type': int,
+        'stream': stream,
+    }
+    numbers.update(kwargs)
+
+    return sargeparse.Sarge({
+        'arguments': [
+            {
+                'names': ['--debug'],
+                'action': 'store_true',
+            },
+            numbers,
+        ],
+    })
+
+
+def test_stream_from_stdin(monkeypatch):
+    stdin = io.TextIOWrapper(io.BytesIO(b'1\0002\0003\0'))
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    sys.argv = ['test']
+
+    args = make_parser('stdin').parse(argv=['--debug'])
+
+    # Nothing is read until the values are used
+    assert stdin.buffer.tell() == 0
+
+    numbers = args['numbers']
+    assert next(numbers) == 1
+    assert list(numbers) == [2, 3]
+    assert list(numbers) == []
+
+
+def test_stream_from_cli(monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'4\n5\n')))
+    sys.argv = ['test']
+    parser = make_parser()
+
+    args = parser.parse(argv=['1', '2'])
+    assert list(args['numbers']) == [1, 2]
+
+    args = parser.parse(argv=['-'])
+    assert list(args['numbers']) == [4, 5]
+
+    # Type errors are raised while iterating
+    args = parser.parse(argv=['x'])
+    with pytest.raises(ValueError):
+        list(args['numbers'])
+
+
+def test_stream_default(monkeypatch):
+    sys.argv = ['test']
+
+    with open(os.devnull, 'r') as devnull:
+        monkeypatch.setattr(sys, 'stdin', devnull)
+
+        # stdin is only read when it's requested
+        args = make_parser(default=['7', '8']).parse(argv=[])
+        assert list(args['numbers']) == [7, 8]
+
+        args = make_parser(default=['7', '8']).parse(argv=['1'])
+        assert list(args['numbers']) == [1]
+
+        assert list(make_parser().parse(argv=[])['numbers']) == []
+
+    stdin = io.TextIOWrapper(io.BytesIO(b'4\n'))
+    monkeypatch.setattr(sys, 'stdin', stdin)
+
+    assert list(make_parser(default=['7']).parse(argv=[])['numbers']) == [7]
+    assert stdin.buffer.tell() == 0
+
+    # With 'stdin', it's read when it isn't a terminal
+    assert list(make_parser('stdin', default=['7']).parse(argv=[])['numbers']) == [4]
+
+    monkeypatch.setattr(stdin, 'isatty', lambda: True)
+    assert list(make_parser('stdin', default=['7']).parse(argv=[])['numbers']) == [7]
+
+
+def test_stream_definition_errors():
+    with pytest.raises(TypeError) as ex:
+        sargeparse.Sarge({
+            'arguments': [
+                {
+                    'names': ['--numbers'],
+                    'nargs': '*',
+                    'stream': True,
+                },
+            ],
+        })
+
+    assert 'stream' in str(ex.value)
+
+    with pytest.raises(TypeError) as ex:
+        make_parser(stream='yes')
+
+    assert 'stream' in str(ex.value)
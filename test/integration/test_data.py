@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from sargeparse._parser.data import ArgumentData
@@ -43,3 +45,37 @@ def test_argument_data_precedence():
         ad.set_precedence(['cli', 'default'])
 
     assert 'must contain all' in str(ex)
+
+
+def test_argument_data_freeze():
+    ad = ArgumentData(None)
+    ad._arg_default.update({'a': None, 'b': None, 'c': None, 'd': None})
+    ad.defaults.update({'a': 'DEFAULT', 'b': 'DEFAULT'})
+    ad.environment.update({'a': 'ENV', 'c': 'ENV'})
+    ad.cli.update({'a': 'CLI'})
+    ad['b'] = 'OVERRIDE'
+
+    frozen = ad.freeze()
+    assert frozen == dict(ad)
+    assert frozen.a == 'CLI'
+    assert frozen['b'] == 'OVERRIDE'
+    assert [frozen.source(k) for k in 'abcd'] == ['cli', 'override', 'environment', 'arg_default']
+
+    with pytest.raises(AttributeError):
+        frozen.nope  # pylint: disable=pointless-statement
+
+    with pytest.raises(TypeError):
+        frozen['a'] = 'X'  # pylint: disable=unsupported-assignment-operation
+
+    # Snapshots don't change with the data, and follow its precedence
+    ad.cli['a'] = 'CLI2'
+    assert frozen.a == 'CLI'
+
+    ad.set_precedence(['environment', 'cli', 'configuration', 'defaults'])
+    frozen = ad.freeze()
+    assert frozen.a == 'ENV'
+    assert frozen.source('a') == 'environment'
+
+    frozen = pickle.loads(pickle.dumps(frozen))
+    assert frozen.a == 'ENV'
+    assert frozen.source('c') == 'environment'
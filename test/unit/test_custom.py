@@ -1,12 +1,13 @@
 # pylint: disable=redefined-outer-name
 
 import re
+import argparse
 
 from unittest.mock import patch
 
 import pytest
 
-from sargeparse.custom import ArgumentParser, HelpFormatter
+from sargeparse.custom import ArgumentParser, ArgumentParserExit, ArgumentParserError, HelpFormatter, raise_on_exit
 
 
 def test_ap_error(capsys):
@@ -63,3 +64,67 @@ def test_subcommand_indentation(capsys):
     match = re.search(r'^(?P<indent>\s+)sub\s+SUBC_HELP\s*$', captured.out, re.MULTILINE)
     assert match
     assert match.group('indent') == indent
+
+
+def test_ap_raise_on_exit(capsys):
+    ap = ArgumentParser(prog='PROG')
+    ap.add_argument('--arg', type=int)
+
+    with raise_on_exit():
+        with pytest.raises(ArgumentParserError) as ex:
+            ap.parse_args(['--arg', 'x'])
+
+        assert ex.value.status == 2
+        assert "invalid int value: 'x'" in ex.value.message
+        assert ex.value.usage.startswith('usage: PROG')
+
+        with pytest.raises(ArgumentParserExit) as ex:
+            ap.parse_args(['--help'])
+
+        assert ex.value.status == 0
+        assert ex.value.output.startswith('usage: PROG')
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err == ''
+
+    with pytest.raises(SystemExit):
+        ap.parse_args(['--arg', 'x'])
+
+
+def test_ap_option_prefix_index():
+    def make_parser(parser_class):
+        ap = parser_class(prog='test')
+        group = ap.add_argument_group('group')
+        for i in range(50):
+            ap.add_argument('--option{}'.format(i))
+            group.add_argument('--flag{}'.format(i), action='store_true')
+        ap.add_argument('-x')
+        ap.add_argument('--xyz')
+        return ap
+
+    ap = make_parser(ArgumentParser)
+    reference = make_parser(argparse.ArgumentParser)
+
+    option_strings = ['--option1', '--option49', '--flag2', '--flag', '--opt', '--f=1', '--option4=2', '--xy',
+                      '-x1', '-xyz', '--nope', '-n']
+    for option_string in option_strings:
+        result = [option_tuple[1:] for option_tuple in ap._get_option_tuples(option_string)]
+        expected = [option_tuple[1:] for option_tuple in reference._get_option_tuples(option_string)]
+        assert result == expected
+
+    args = ap.parse_args(['--option4', '1', '--option49=2', '--flag4', '--xy', '3', '-x4'])
+    assert args.option4 == '1'
+    assert args.option49 == '2'
+    assert args.flag4 is True
+    assert args.xyz == '3'
+    assert args.x == '4'
+
+    # Index is rebuilt when options are added
+    ap.add_argument('--late-option')
+    assert ap.parse_args(['--late', '5']).late_option == '5'
+
+    with raise_on_exit(), pytest.raises(ArgumentParserError) as ex:
+        ap.parse_args(['--option1', '1', '--opt'])
+
+    assert re.search('ambiguous option: --opt could match --option0, --option1, ', ex.value.message)